@@ -8,8 +8,19 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+from config.db import init_app as init_db
+from middleware.metricsMiddleware import init_app as init_metrics
+from middleware.profilerMiddleware import init_app as init_profiler
+from services.jsonProvider import FastJSONProvider
+from services.jobQueue import init_app as init_jobs
+
 app = Flask(__name__, static_folder="public")
+app.json = FastJSONProvider(app)  # orjson when installed, stdlib otherwise
 CORS(app)  # Enable CORS
+init_db(app)  # Return request-scoped DB connections to the pool
+init_metrics(app)  # Latency histograms, served at /api/metrics
+init_profiler(app)  # Per-request stack sampling for admins (X-Profile: 1)
+init_jobs(app)  # Background job workers (services/jobQueue.py)
 
 # ====================
 # ROUTES IMPORTS
@@ -29,7 +29,7 @@ CREATE TABLE `admin_comments` (
   `comment` text NOT NULL,
   `created_at` timestamp NULL DEFAULT CURRENT_TIMESTAMP,
   PRIMARY KEY (`id`),
-  KEY `complaint_id` (`complaint_id`),
+  KEY `idx_complaint_created` (`complaint_id`,`created_at`),
   KEY `admin_id` (`admin_id`),
   CONSTRAINT `admin_comments_ibfk_1` FOREIGN KEY (`complaint_id`) REFERENCES `complaints` (`id`) ON DELETE CASCADE,
   CONSTRAINT `admin_comments_ibfk_2` FOREIGN KEY (`admin_id`) REFERENCES `users` (`id`) ON DELETE CASCADE
@@ -50,6 +50,44 @@ CREATE TABLE `admin_settings` (
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
+--
+-- Table structure for table `attachments`
+--
+
+DROP TABLE IF EXISTS `attachments`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `attachments` (
+  `id` int NOT NULL AUTO_INCREMENT,
+  `sha256` char(64) NOT NULL,
+  `size` bigint NOT NULL,
+  `mime_type` varchar(100) NOT NULL,
+  `created_at` timestamp NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `uq_sha256` (`sha256`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Table structure for table `complaint_counters`
+--
+
+DROP TABLE IF EXISTS `complaint_counters`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `complaint_counters` (
+  `status` enum('Pending','In Progress','Solved','Rejected','Unsolved') NOT NULL,
+  `type` varchar(100) NOT NULL,
+  `day` date NOT NULL,
+  `total` int NOT NULL DEFAULT '0',
+  `unassigned` int NOT NULL DEFAULT '0',
+  `resolution_days` bigint NOT NULL DEFAULT '0',
+  `resolution_samples` int NOT NULL DEFAULT '0',
+  PRIMARY KEY (`status`,`type`,`day`),
+  KEY `day` (`day`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
 --
 -- Table structure for table `complaints`
 --
@@ -64,16 +102,43 @@ CREATE TABLE `complaints` (
   `type` varchar(100) NOT NULL,
   `description` text NOT NULL,
   `attachment` varchar(255) DEFAULT NULL,
+  `attachment_id` int DEFAULT NULL,
   `status` enum('Pending','In Progress','Solved','Rejected','Unsolved') DEFAULT 'Pending',
   `created_at` timestamp NULL DEFAULT CURRENT_TIMESTAMP,
   `updated_at` timestamp NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   `assigned_to` int DEFAULT NULL,
   PRIMARY KEY (`id`),
-  KEY `user_id` (`user_id`),
+  KEY `idx_user_status_created` (`user_id`,`status`,`created_at`),
+  KEY `idx_status_updated` (`status`,`updated_at`),
+  KEY `idx_created_at` (`created_at`),
+  KEY `idx_assigned_to` (`assigned_to`),
+  KEY `idx_attachment_id` (`attachment_id`),
+  FULLTEXT KEY `ft_subject_type` (`subject`,`type`),
+  CONSTRAINT `complaints_attachment_fk` FOREIGN KEY (`attachment_id`) REFERENCES `attachments` (`id`),
   CONSTRAINT `complaints_ibfk_1` FOREIGN KEY (`user_id`) REFERENCES `users` (`id`)
 ) ENGINE=InnoDB AUTO_INCREMENT=18 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
+--
+-- Table structure for table `idempotency_keys`
+--
+
+DROP TABLE IF EXISTS `idempotency_keys`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `idempotency_keys` (
+  `user_id` int NOT NULL,
+  `idem_key` varchar(255) NOT NULL,
+  `request_hash` char(64) NOT NULL,
+  `status_code` smallint DEFAULT NULL,
+  `content_type` varchar(100) DEFAULT NULL,
+  `response_body` mediumblob,
+  `expires_at` datetime NOT NULL,
+  PRIMARY KEY (`user_id`,`idem_key`),
+  KEY `idx_expires_at` (`expires_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
 --
 -- Table structure for table `roles`
 --
@@ -89,6 +154,30 @@ CREATE TABLE `roles` (
 ) ENGINE=InnoDB AUTO_INCREMENT=5 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
+--
+-- Table structure for table `schema_migrations`
+--
+
+DROP TABLE IF EXISTS `schema_migrations`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `schema_migrations` (
+  `version` varchar(100) NOT NULL,
+  `checksum` char(64) DEFAULT NULL,
+  `applied_at` timestamp NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`version`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Dumping data for table `schema_migrations`
+-- (this file already contains every migration in config/migrations)
+--
+
+LOCK TABLES `schema_migrations` WRITE;
+INSERT INTO `schema_migrations` (`version`) VALUES ('0001_fulltext_search'),('0002_complaint_counters'),('0003_covering_indexes'),('0004_attachments'),('0005_idempotency_keys');
+UNLOCK TABLES;
+
 --
 -- Table structure for table `users`
 --
@@ -112,7 +201,9 @@ CREATE TABLE `users` (
   `staff_status` enum('Pending','Authorized','Rejected') DEFAULT 'Pending',
   PRIMARY KEY (`id`),
   UNIQUE KEY `email` (`email`),
-  KEY `role_id` (`role_id`),
+  KEY `idx_role_status` (`role_id`,`staff_status`),
+  FULLTEXT KEY `ft_name` (`first_name`,`last_name`),
+  FULLTEXT KEY `ft_name_email` (`first_name`,`last_name`,`email`),
   CONSTRAINT `users_ibfk_1` FOREIGN KEY (`role_id`) REFERENCES `roles` (`id`)
 ) ENGINE=InnoDB AUTO_INCREMENT=23 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
@@ -1,8 +1,17 @@
 # config/db.py
 
 import os
+import re
+import sys
+import logging
+import threading
+import time
 import mysql.connector
 from mysql.connector import pooling
+from mysql.connector.errors import PoolError
+from flask import g
+
+from services import metrics
 
 # IMPORTANT:
 # Do NOT use load_dotenv() in production (Render)
@@ -14,6 +23,15 @@ DB_PASSWORD = os.environ.get("DB_PASSWORD")
 DB_NAME = os.environ.get("DB_NAME")
 DB_PORT = int(os.environ.get("DB_PORT", "3306"))
 
+# Pool sizing (32 is too high for Render free tier)
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "10"))
+# Seconds a request waits for a free connection before giving up
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "5"))
+# Statements slower than this (execute + fetch) go to the "db.slow" logger; 0 disables
+DB_SLOW_QUERY_MS = float(os.environ.get("DB_SLOW_QUERY_MS", "200"))
+
+slow_log = logging.getLogger("db.slow")
+
 # Safety validation (prevents silent failures)
 if not DB_HOST or not DB_USER or not DB_NAME:
     raise RuntimeError("Database environment variables are missing")
@@ -32,10 +50,316 @@ dbconfig = {
 # Create connection pool
 connection_pool = pooling.MySQLConnectionPool(
     pool_name="mypool",
-    pool_size=10,          # 32 is too high for Render free tier
+    pool_size=DB_POOL_SIZE,
     pool_reset_session=True,
     **dbconfig
 )
 
+
+# ====================
+# POOL INSTRUMENTATION
+# ====================
+class PoolStats:
+    """Live counters for the connection pool (thread-safe)."""
+
+    def __init__(self, size):
+        self.size = size
+        self._lock = threading.Lock()
+        self.checked_out = 0
+        self.max_checked_out = 0
+        self.checkouts = 0
+        self.exhaustion_events = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_checkout(self, waited):
+        with self._lock:
+            self.checked_out += 1
+            self.checkouts += 1
+            self.max_checked_out = max(self.max_checked_out, self.checked_out)
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def record_checkin(self):
+        with self._lock:
+            self.checked_out -= 1
+
+    def record_exhaustion(self, waited):
+        with self._lock:
+            self.exhaustion_events += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def snapshot(self):
+        with self._lock:
+            attempts = self.checkouts + self.exhaustion_events
+            return {
+                "poolSize": self.size,
+                "checkedOut": self.checked_out,
+                "maxCheckedOut": self.max_checked_out,
+                "checkouts": self.checkouts,
+                "exhaustionEvents": self.exhaustion_events,
+                "waitSecondsTotal": round(self.wait_seconds_total, 6),
+                "waitSecondsMax": round(self.wait_seconds_max, 6),
+                "waitSecondsAvg": round(self.wait_seconds_total / attempts, 6) if attempts else 0.0
+            }
+
+
+pool_stats = PoolStats(DB_POOL_SIZE)
+
+# MySQLConnectionPool raises immediately when empty; the semaphore lets
+# callers queue for a slot (up to DB_POOL_TIMEOUT) and makes waits measurable.
+_pool_slots = threading.BoundedSemaphore(DB_POOL_SIZE)
+
+
+# ====================
+# STATEMENT INSTRUMENTATION
+# ====================
+# Frames in these functions / modules are helpers, not the code that owns the query
+_HELPER_FUNCTIONS = {"query_db", "_run_query"}
+_HELPER_MODULES = {"services.singleFlight", "models.fetch"}
+_THIS_FILE = __file__
+
+
+def _caller():
+    """'module.function' of the first frame outside this file and query helpers."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        module = frame.f_globals.get("__name__", "?")
+        if (code.co_filename != _THIS_FILE and code.co_name not in _HELPER_FUNCTIONS
+                and module not in _HELPER_MODULES):
+            return f"{module.rsplit('.', 1)[-1]}.{code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+def _verb(sql):
+    if isinstance(sql, (bytes, bytearray)):
+        sql = sql.decode("utf-8", "replace")
+    words = str(sql).split(None, 1)
+    return words[0].upper() if words else "?"
+
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+def normalize_sql(sql):
+    """One-line SQL with literals and placeholders replaced by '?'."""
+    if isinstance(sql, (bytes, bytearray)):
+        sql = sql.decode("utf-8", "replace")
+    text = " ".join(str(sql).split())
+    text = _STRING_LITERAL.sub("?", text)
+    text = _NUMBER_LITERAL.sub("?", text)
+    text = text.replace("%s", "?")
+    return _PLACEHOLDER_LIST.sub("(?...)", text)
+
+
+def param_shapes(params):
+    """Types (and lengths) of bound parameters - never their values."""
+    def shape(value):
+        if value is None:
+            return "None"
+        if isinstance(value, (str, bytes, bytearray)):
+            return f"{type(value).__name__}({len(value)})"
+        return type(value).__name__
+
+    if params is None:
+        return []
+    if isinstance(params, dict):
+        return {key: shape(value) for key, value in params.items()}
+    if isinstance(params, list) and params and isinstance(params[0], (list, tuple, dict)):
+        # executemany(): one row's shape is enough
+        return {"rows": len(params), "each": param_shapes(params[0])}
+    if isinstance(params, (list, tuple)):
+        return [shape(value) for value in params]
+    return shape(params)
+
+
+def _log_slow(caller, operation, params, seconds, rows):
+    if not DB_SLOW_QUERY_MS or seconds * 1000 < DB_SLOW_QUERY_MS:
+        return
+    slow_log.warning(
+        "slow query %.1fms caller=%s rows=%d params=%s sql=%s",
+        seconds * 1000, caller, rows, param_shapes(params), normalize_sql(operation)[:2000]
+    )
+
+
+class InstrumentedCursor:
+    """Cursor wrapper recording latency and row counts per statement.
+
+    A statement's time is its execute() plus every fetch on its result set;
+    it is recorded once the result is exhausted, the next statement runs or
+    the cursor closes. Statements over DB_SLOW_QUERY_MS are also logged.
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._pending = None  # [caller, verb, seconds, rows, operation, params]
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        row = self.fetchone()
+        while row is not None:
+            yield row
+            row = self.fetchone()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _finish(self):
+        pending, self._pending = self._pending, None
+        if pending:
+            caller, verb, seconds, rows, operation, params = pending
+            metrics.db_query_duration.observe(seconds, caller, verb)
+            metrics.db_query_rows_total.inc(rows, caller, verb)
+            _log_slow(caller, operation, params, seconds, rows)
+
+    def _run(self, method, operation, args, kwargs):
+        self._finish()
+        caller, verb = _caller(), _verb(operation)
+        start = time.perf_counter()
+        try:
+            return method(operation, *args, **kwargs)
+        finally:
+            params = args[0] if args else kwargs.get("params", kwargs.get("seq_params"))
+            self._pending = [caller, verb, time.perf_counter() - start, 0, operation, params]
+            if not self._cursor.with_rows:
+                self._pending[3] = max(self._cursor.rowcount, 0)
+                self._finish()
+
+    def execute(self, operation, *args, **kwargs):
+        return self._run(self._cursor.execute, operation, args, kwargs)
+
+    def executemany(self, operation, *args, **kwargs):
+        return self._run(self._cursor.executemany, operation, args, kwargs)
+
+    def _fetch(self, method, *args):
+        start = time.perf_counter()
+        result = method(*args)
+        if self._pending:
+            self._pending[2] += time.perf_counter() - start
+        return result
+
+    def fetchone(self):
+        row = self._fetch(self._cursor.fetchone)
+        if self._pending:
+            if row is None:
+                self._finish()
+            else:
+                self._pending[3] += 1
+        return row
+
+    def fetchmany(self, *args):
+        rows = self._fetch(self._cursor.fetchmany, *args)
+        if self._pending:
+            self._pending[3] += len(rows)
+            if not rows:
+                self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._fetch(self._cursor.fetchall)
+        if self._pending:
+            self._pending[3] += len(rows)
+            self._finish()
+        return rows
+
+    def close(self):
+        self._finish()
+        return self._cursor.close()
+
+
+class TrackedConnection:
+    """Pooled connection wrapper that gives its slot back exactly once on close()."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._closed = False
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._conn.cursor(*args, **kwargs))
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._conn.close()
+        finally:
+            _pool_slots.release()
+            pool_stats.record_checkin()
+
+
 def get_connection():
-    return connection_pool.get_connection()
\ No newline at end of file
+    """Check a connection out of the pool; the caller must close() it."""
+    start = time.perf_counter()
+    acquired = _pool_slots.acquire(timeout=DB_POOL_TIMEOUT)
+    waited = time.perf_counter() - start
+    metrics.db_pool_wait.observe(waited)
+    if not acquired:
+        pool_stats.record_exhaustion(waited)
+        raise PoolError(f"Connection pool exhausted after waiting {waited:.2f}s")
+
+    try:
+        conn = connection_pool.get_connection()
+    except Exception:
+        _pool_slots.release()
+        raise
+
+    pool_stats.record_checkout(waited)
+    return TrackedConnection(conn)
+
+
+# ====================
+# REQUEST-SCOPED CONNECTION
+# ====================
+def get_db():
+    """Connection bound to the current request.
+
+    Checked out lazily on first use, shared by every query in the request
+    and returned to the pool by close_db() when the app context tears down.
+    """
+    if "db_conn" not in g:
+        g.db_conn = get_connection()
+    return g.db_conn
+
+
+def close_db(exc=None):
+    conn = g.pop("db_conn", None)
+    if conn is None:
+        return
+    try:
+        # Never leave half-finished work for the next borrower
+        conn.rollback()
+    except Exception:
+        pass
+    finally:
+        conn.close()
+
+
+def get_pool_stats():
+    return pool_stats.snapshot()
+
+
+metrics.registry.register(metrics.Gauge(
+    "db_pool_size", "Configured connection pool size.", lambda: pool_stats.size))
+metrics.registry.register(metrics.Gauge(
+    "db_pool_checked_out", "Connections currently checked out.", lambda: pool_stats.checked_out))
+metrics.registry.register(metrics.Gauge(
+    "db_pool_exhaustion_events", "Checkouts that timed out waiting for a slot.",
+    lambda: pool_stats.exhaustion_events))
+
+
+def init_app(app):
+    app.teardown_appcontext(close_db)
@@ -0,0 +1,150 @@
+# config/migrate.py
+#
+# Versioned schema migrations. Every config/migrations/NNNN_name.sql file is
+# applied once, in order, and recorded in the schema_migrations table, so
+# this is safe to run on every deploy (run from backend/):
+#
+#   python -m config.migrate            # apply pending migrations
+#   python -m config.migrate status     # list applied / pending
+#   python -m config.migrate baseline   # mark all as applied without running
+#                                       # (databases already on the latest schema)
+import hashlib
+import os
+import re
+import sys
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+# Serializes concurrent deploys; the second runner waits, then finds nothing to do
+LOCK_NAME = "complaint_db_migrations"
+LOCK_TIMEOUT = 300
+
+_FILE_RE = re.compile(r"^(\d{4})_[\w-]+\.sql$")
+
+
+def discover():
+    """[(version, path)] sorted by version number."""
+    found = []
+    for name in sorted(os.listdir(MIGRATIONS_DIR)):
+        if _FILE_RE.match(name):
+            found.append((name[:-4], os.path.join(MIGRATIONS_DIR, name)))
+    return found
+
+
+def checksum(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def split_statements(sql):
+    """Split a migration file on ';' at end of line, dropping -- comments."""
+    lines = [line for line in sql.splitlines() if not line.strip().startswith("--")]
+    statements = re.split(r";\s*$", "\n".join(lines), flags=re.MULTILINE)
+    return [s.strip() for s in statements if s.strip()]
+
+
+def ensure_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version varchar(100) NOT NULL,
+            checksum char(64) DEFAULT NULL,
+            applied_at timestamp NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (version)
+        )
+    """)
+
+
+def applied_versions(cursor):
+    cursor.execute("SELECT version, checksum FROM schema_migrations")
+    return dict(cursor.fetchall())
+
+
+def record(cursor, version, digest):
+    cursor.execute(
+        "INSERT INTO schema_migrations (version, checksum) VALUES (%s, %s) AS new "
+        "ON DUPLICATE KEY UPDATE checksum = new.checksum",
+        (version, digest)
+    )
+
+
+def migrate(conn, baseline=False):
+    """Apply (or with baseline=True, just record) every pending migration.
+
+    Returns the list of versions handled. DDL auto-commits in MySQL, so a
+    failing file stops the run with the earlier files already recorded.
+    """
+    cursor = conn.cursor()
+    done = []
+    try:
+        cursor.execute("SELECT GET_LOCK(%s, %s)", (LOCK_NAME, LOCK_TIMEOUT))
+        if cursor.fetchone()[0] != 1:
+            raise RuntimeError("Another migration run holds the lock")
+        try:
+            ensure_table(cursor)
+            applied = applied_versions(cursor)
+
+            for version, path in discover():
+                digest = checksum(path)
+                if version in applied:
+                    if applied[version] and applied[version] != digest:
+                        print(f"WARNING: {version} changed after it was applied")
+                    continue
+
+                if not baseline:
+                    print(f"Applying {version} ...")
+                    with open(path, encoding="utf-8") as f:
+                        for statement in split_statements(f.read()):
+                            cursor.execute(statement)
+                            if cursor.with_rows:
+                                cursor.fetchall()
+                record(cursor, version, digest)
+                conn.commit()
+                done.append(version)
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+            cursor.fetchall()
+    finally:
+        cursor.close()
+    return done
+
+
+def status(conn):
+    cursor = conn.cursor()
+    try:
+        ensure_table(cursor)
+        applied = applied_versions(cursor)
+    finally:
+        cursor.close()
+    return [(version, version in applied) for version, _ in discover()]
+
+
+def main(argv):
+    from dotenv import load_dotenv
+    load_dotenv()
+    from config.db import get_connection
+
+    command = argv[1] if len(argv) > 1 else "up"
+    if command not in ("up", "status", "baseline"):
+        print("usage: python -m config.migrate [up|status|baseline]")
+        return 2
+
+    conn = get_connection()
+    try:
+        if command == "status":
+            for version, is_applied in status(conn):
+                print(f"{'applied' if is_applied else 'pending'}  {version}")
+            return 0
+
+        try:
+            done = migrate(conn, baseline=(command == "baseline"))
+        except Exception as err:
+            print(f"Migration failed: {err}")
+            return 1
+        verb = "Recorded" if command == "baseline" else "Applied"
+        print(f"{verb} {len(done)} migration(s)" + (": " + ", ".join(done) if done else ""))
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
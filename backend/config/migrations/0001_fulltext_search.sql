@@ -0,0 +1,9 @@
+-- FULLTEXT indexes behind services/search.py (MATCH ... AGAINST IN BOOLEAN MODE).
+-- Each MATCH column list must equal one of these indexes exactly.
+
+ALTER TABLE `complaints`
+  ADD FULLTEXT KEY `ft_subject_type` (`subject`,`type`);
+
+ALTER TABLE `users`
+  ADD FULLTEXT KEY `ft_name` (`first_name`,`last_name`),
+  ADD FULLTEXT KEY `ft_name_email` (`first_name`,`last_name`,`email`);
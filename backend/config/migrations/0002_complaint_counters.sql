@@ -0,0 +1,33 @@
+-- Summary table maintained by services/complaintCounters.py, filled from
+-- the existing complaints (re-running the fill is harmless: it overwrites
+-- each bucket with its recount).
+
+CREATE TABLE IF NOT EXISTS `complaint_counters` (
+  `status` enum('Pending','In Progress','Solved','Rejected','Unsolved') NOT NULL,
+  `type` varchar(100) NOT NULL,
+  `day` date NOT NULL,
+  `total` int NOT NULL DEFAULT '0',
+  `unassigned` int NOT NULL DEFAULT '0',
+  `resolution_days` bigint NOT NULL DEFAULT '0',
+  `resolution_samples` int NOT NULL DEFAULT '0',
+  PRIMARY KEY (`status`,`type`,`day`),
+  KEY `day` (`day`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+INSERT INTO `complaint_counters`
+    (`status`, `type`, `day`, `total`, `unassigned`, `resolution_days`, `resolution_samples`)
+SELECT * FROM (
+    SELECT status, type, DATE(created_at) AS day,
+           COUNT(*) AS total,
+           SUM(assigned_to IS NULL) AS unassigned,
+           COALESCE(SUM(CASE WHEN status = 'Solved' THEN DATEDIFF(updated_at, created_at) END), 0) AS resolution_days,
+           COUNT(CASE WHEN status = 'Solved' THEN DATEDIFF(updated_at, created_at) END) AS resolution_samples
+    FROM complaints
+    WHERE status IS NOT NULL
+    GROUP BY status, type, DATE(created_at)
+) AS recount
+ON DUPLICATE KEY UPDATE
+    `total` = recount.total,
+    `unassigned` = recount.unassigned,
+    `resolution_days` = recount.resolution_days,
+    `resolution_samples` = recount.resolution_samples;
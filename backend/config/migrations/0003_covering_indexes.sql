@@ -0,0 +1,26 @@
+-- Composite indexes for the hot list / statistics query shapes.
+-- InnoDB appends the primary key (id) to every secondary index, so the
+-- (..., created_at) and (..., updated_at) keys also serve the keyset
+-- pagination tie-breaker on id.
+
+-- User solved/unsolved lists: WHERE user_id = ? AND status = ? ORDER BY created_at DESC.
+-- Also serves the user_id foreign key, so the single-column key goes.
+-- Staff solved list and recently closed: WHERE status = 'Solved' ORDER BY updated_at DESC.
+-- Admin/staff lists, recent complaints, longest open: ORDER BY created_at.
+-- Staff assignment stats: LEFT JOIN complaints ON assigned_to.
+ALTER TABLE `complaints`
+  ADD KEY `idx_user_status_created` (`user_id`,`status`,`created_at`),
+  ADD KEY `idx_status_updated` (`status`,`updated_at`),
+  ADD KEY `idx_created_at` (`created_at`),
+  ADD KEY `idx_assigned_to` (`assigned_to`),
+  DROP KEY `user_id`;
+
+-- Complaint detail comments: WHERE complaint_id = ? ORDER BY created_at.
+ALTER TABLE `admin_comments`
+  ADD KEY `idx_complaint_created` (`complaint_id`,`created_at`),
+  DROP KEY `complaint_id`;
+
+-- Staff lookups: WHERE role_id = ? AND staff_status = ?.
+ALTER TABLE `users`
+  ADD KEY `idx_role_status` (`role_id`,`staff_status`),
+  DROP KEY `role_id`;
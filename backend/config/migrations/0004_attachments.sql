@@ -0,0 +1,19 @@
+-- Content-addressed complaint attachments (services/attachments.py).
+-- One row per distinct file content; the file itself lives on disk under
+-- its SHA-256. complaints.attachment keeps the uploaded file's name for
+-- display, complaints.attachment_id points at the content.
+
+CREATE TABLE IF NOT EXISTS `attachments` (
+  `id` int NOT NULL AUTO_INCREMENT,
+  `sha256` char(64) NOT NULL,
+  `size` bigint NOT NULL,
+  `mime_type` varchar(100) NOT NULL,
+  `created_at` timestamp NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `uq_sha256` (`sha256`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+ALTER TABLE `complaints`
+  ADD COLUMN `attachment_id` int DEFAULT NULL AFTER `attachment`,
+  ADD KEY `idx_attachment_id` (`attachment_id`),
+  ADD CONSTRAINT `complaints_attachment_fk` FOREIGN KEY (`attachment_id`) REFERENCES `attachments` (`id`);
@@ -0,0 +1,15 @@
+-- Idempotency-Key reservations and stored responses (services/idempotency.py).
+-- status_code is NULL while the first request is still running. Rows past
+-- expires_at are ignored and deleted by the "idempotency.purge" job.
+
+CREATE TABLE IF NOT EXISTS `idempotency_keys` (
+  `user_id` int NOT NULL,
+  `idem_key` varchar(255) NOT NULL,
+  `request_hash` char(64) NOT NULL,
+  `status_code` smallint DEFAULT NULL,
+  `content_type` varchar(100) DEFAULT NULL,
+  `response_body` mediumblob,
+  `expires_at` datetime NOT NULL,
+  PRIMARY KEY (`user_id`, `idem_key`),
+  KEY `idx_expires_at` (`expires_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
@@ -1,38 +1,65 @@
 # controllers/adminController.py
-from flask import request, jsonify
-from config.db import get_connection
-
-# Helper function to run queries
-def query_db(query, params=None, commit=False):
-    conn = get_connection()
+import json
+from datetime import datetime
+from flask import request, jsonify, g
+from config.db import get_db, get_pool_stats
+from services.statsService import complaint_summary
+from services.complaintCounters import update_complaint
+from services.pagination import Keyset, InvalidPageRequest, get_page_request, MAX_LIMIT
+from services.search import complaint_search, user_search
+from services.referenceData import role_id, authorized_staff, invalidate_staff
+from services.responseCache import response_cache, invalidate, COMPLAINTS, USERS, complaint_tag
+from services.singleFlight import flight, coalesce
+from services.export import stream_query, export_format, InvalidExportRequest
+from services.jobQueue import enqueue
+from models.rows import Comment
+
+# Sort keys for the paginated lists (RANKED_* when a fulltext search is active)
+USER_KEYSET = Keyset(("u.id", "id"), descending=False)
+RANKED_USER_KEYSET = Keyset(("s.relevance", "relevance"), ("u.id", "id"), hidden=("relevance",))
+# getComplaints selects c.created_at under its response name, "submitted"
+COMPLAINT_KEYSET = Keyset(("c.created_at", "submitted"), ("c.id", "id"))
+RANKED_COMPLAINT_KEYSET = Keyset(("s.relevance", "relevance"), ("c.id", "id"), hidden=("relevance",))
+
+# Helper function to run queries on the request's connection.
+# Writes (commit=True) return the number of affected rows.
+# Reads marked coalesce=True share one execution with identical concurrent
+# calls in this worker (only for results that do not depend on the caller).
+def query_db(query, params=None, commit=False, coalesce=False):
+    if coalesce and not commit:
+        key = ("query_db", query, tuple(params or ()))
+        return flight.do(key, _run_query, query, params, False, name="query_db")
+    return _run_query(query, params, commit)
+
+
+def _run_query(query, params, commit):
+    conn = get_db()
     cursor = conn.cursor(dictionary=True)
-    cursor.execute(query, params or [])
-    if commit:
-        conn.commit()
+    try:
+        cursor.execute(query, params or [])
+        if commit:
+            conn.commit()
+            return cursor.rowcount
+        return cursor.fetchall()
+    finally:
         cursor.close()
-        return None
-    rows = cursor.fetchall()
-    cursor.close()
-    return rows
 
 
 # Dashboard stats for admin cards
+@coalesce("admin.dashboard_stats")
+def _dashboard_stats():
+    usersRes = query_db("SELECT COUNT(*) AS totalUsers FROM users")
+    summary = complaint_summary()
+    return {
+        "totalUsers": usersRes[0]["totalUsers"],
+        "totalComplaints": summary["total"],
+        "solvedComplaints": summary["solved"],
+        "newComplaints": summary["newToday"]
+    }
+
 def getDashboardStats():
     try:
-        usersRes = query_db("SELECT COUNT(*) AS totalUsers FROM users")
-        complaintsRes = query_db("SELECT COUNT(*) AS totalComplaints FROM complaints")
-        solvedRes = query_db("SELECT COUNT(*) AS solvedComplaints FROM complaints WHERE status = 'Solved'")
-        todayRes = query_db("""
-            SELECT COUNT(*) AS newComplaints FROM complaints
-            WHERE DATE(created_at) = CURDATE()
-        """)
-
-        return jsonify({
-            "totalUsers": usersRes[0]["totalUsers"],
-            "totalComplaints": complaintsRes[0]["totalComplaints"],
-            "solvedComplaints": solvedRes[0]["solvedComplaints"],
-            "newComplaints": todayRes[0]["newComplaints"]
-        })
+        return jsonify(_dashboard_stats())
     except Exception as err:
         return jsonify({"message": "Error fetching dashboard stats", "error": str(err)}), 500
 
@@ -45,7 +72,7 @@ def getRecentComplaints():
             JOIN users u ON c.user_id = u.id
             ORDER BY c.created_at DESC
             LIMIT 10
-        """)
+        """, coalesce=True)
         complaints = [{
             "number": idx + 1,
             "user": f"{row['first_name']} {row['last_name']}",
@@ -85,18 +112,7 @@ def getComplaintDetails(id):
 
 def getStatistics():
     try:
-        complaintsRes = query_db("SELECT COUNT(*) AS totalComplaints FROM complaints")
-        pendingRes = query_db("SELECT COUNT(*) AS pending FROM complaints WHERE status='Pending'")
-        inProgressRes = query_db("SELECT COUNT(*) AS inProgress FROM complaints WHERE status='In Progress'")
-        solvedRes = query_db("SELECT COUNT(*) AS solved FROM complaints WHERE status='Solved'")
-        rejectedRes = query_db("SELECT COUNT(*) AS rejected FROM complaints WHERE status='Rejected'")
-        unassignedRes = query_db("SELECT COUNT(*) AS unassigned FROM complaints WHERE assigned_to IS NULL")
-        avgResolutionRes = query_db("""
-            SELECT AVG(DATEDIFF(updated_at, created_at)) AS avgResolutionDays
-            FROM complaints
-            WHERE status='Solved'
-        """)
-        byType = query_db("SELECT type, COUNT(*) AS count FROM complaints GROUP BY type")
+        summary = complaint_summary()
         byRole = query_db("""
             SELECT r.name AS role, COUNT(*) AS count
             FROM complaints c
@@ -105,81 +121,102 @@ def getStatistics():
             GROUP BY r.name
         """)
         return jsonify({
-            "totalComplaints": complaintsRes[0]["totalComplaints"] if complaintsRes else 0,
-            "pending": pendingRes[0]["pending"] if pendingRes else 0,
-            "inProgress": inProgressRes[0]["inProgress"] if inProgressRes else 0,
-            "solved": solvedRes[0]["solved"] if solvedRes else 0,
-            "rejected": rejectedRes[0]["rejected"] if rejectedRes else 0,
-            "unassigned": unassignedRes[0]["unassigned"] if unassignedRes else 0,
-            "avgResolutionDays": round(avgResolutionRes[0]["avgResolutionDays"], 2) if avgResolutionRes and avgResolutionRes[0]["avgResolutionDays"] else 0,
-            "byType": [{"type": r["type"], "count": r["count"]} for r in byType],
+            "totalComplaints": summary["total"],
+            "pending": summary["pending"],
+            "inProgress": summary["inProgress"],
+            "solved": summary["solved"],
+            "rejected": summary["rejected"],
+            "unassigned": summary["unassigned"],
+            "avgResolutionDays": summary["avgResolutionDays"],
+            "byType": [{"type": t["type"], "count": t["total"]} for t in summary["byType"]],
             "byRole": [{"role": r["role"], "count": r["count"]} for r in byRole]
         })
     except Exception as err:
         return jsonify({"message": "Error fetching statistics", "error": str(err)}), 500
 
 
+# Users list query with the ?search= / ?role= filters, shared by the list and export
+def _user_list_query():
+    search = request.args.get("search", "")
+    role = request.args.get("role", "")
+    found = user_search(search)
+    sql = f"""
+        SELECT 
+            u.id,
+            CONCAT(COALESCE(u.first_name,''),' ',COALESCE(u.last_name,'')) AS name,
+            u.email,
+            r.name AS role,
+            CASE
+                WHEN u.role_id = %s THEN COALESCE(u.staff_status,'Pending')
+                ELSE 'N/A'
+            END AS status
+            {found.columns}
+        FROM users u
+        {found.join}
+        JOIN roles r ON u.role_id = r.id
+        WHERE 1=1
+    """ + found.where
+    params = [role_id("staff") or 0] + found.join_params + found.where_params
+    if role:
+        # Unknown role names match nothing (role ids start at 1)
+        sql += " AND u.role_id = %s"
+        params.append(role_id(role) or 0)
+    return sql, params, found
+
 # Get all users
 def getAllUsers():
     try:
-        search = request.args.get("search", "")
-        role = request.args.get("role", "")
-        sql = """
-            SELECT 
-                u.id,
-                CONCAT(COALESCE(u.first_name,''),' ',COALESCE(u.last_name,'')) AS name,
-                u.email,
-                r.name AS role,
-                CASE
-                    WHEN LOWER(r.name) = 'staff' THEN COALESCE(u.staff_status,'Pending')
-                    ELSE 'N/A'
-                END AS status
-            FROM users u
-            JOIN roles r ON u.role_id = r.id
-            WHERE 1=1
-        """
-        params = []
-        if search:
-            sql += " AND (u.first_name LIKE %s OR u.last_name LIKE %s OR u.email LIKE %s)"
-            params.extend([f"%{search}%", f"%{search}%", f"%{search}%"])
-        if role:
-            sql += " AND LOWER(r.name) = %s"
-            params.append(role.lower())
-        sql += " ORDER BY u.id ASC"
+        sql, params, found = _user_list_query()
+        keyset = RANKED_USER_KEYSET if found.ranked else USER_KEYSET
+        page = get_page_request()
+        sql, params = keyset.apply(sql, params, page)
         users = query_db(sql, params)
-        return jsonify(users)
+        return keyset.respond(users, users, page)
+    except InvalidPageRequest as err:
+        return jsonify({"message": str(err)}), 400
     except Exception as err:
         return jsonify({"message": "Server error", "error": str(err)}), 500
 
+# Stream every matching user as CSV / NDJSON
+def exportUsers():
+    try:
+        fmt = export_format()
+        sql, params, found = _user_list_query()
+        keyset = RANKED_USER_KEYSET if found.ranked else USER_KEYSET
+        return stream_query(sql, params, keyset, fmt, "users")
+    except InvalidExportRequest as err:
+        return jsonify({"message": str(err)}), 400
+    except Exception as err:
+        return jsonify({"message": "Error exporting users", "error": str(err)}), 500
+
 def getLongestOpenComplaints():
     try:
-        db = get_connection()
+        db = get_db()
         cursor = db.cursor(dictionary=True)
         search = request.args.get("search", "")
         status = request.args.get("status", "")
         role = request.args.get("role", "")
 
-        sql = """
+        found = complaint_search(search, ("c.subject", "u.first_name", "u.last_name", "c.id"))
+        sql = f"""
             SELECT c.id, c.subject, c.status, c.created_at, c.assigned_to,
                    u.first_name, u.last_name, r.name AS user_role,
                    a.first_name AS assigned_first, a.last_name AS assigned_last
             FROM complaints c
+            {found.join}
             JOIN users u ON c.user_id = u.id
             JOIN roles r ON u.role_id = r.id
             LEFT JOIN users a ON c.assigned_to = a.id
             WHERE c.status != 'Solved'
-        """
-        params = []
+        """ + found.where
+        params = found.join_params + found.where_params
 
-        if search:
-            sql += " AND (c.subject LIKE %s OR u.first_name LIKE %s OR u.last_name LIKE %s OR c.id LIKE %s)"
-            params.extend([f"%{search}%", f"%{search}%", f"%{search}%", f"%{search}%"])
         if status:
             sql += " AND c.status = %s"
             params.append(status)
         if role:
-            sql += " AND LOWER(r.name) = %s"
-            params.append(role.lower())
+            sql += " AND u.role_id = %s"
+            params.append(role_id(role) or 0)
 
         sql += " ORDER BY c.created_at ASC LIMIT 15"
         cursor.execute(sql, params)
@@ -213,7 +250,7 @@ def getLongestOpenComplaints():
 
 def getRecentlyClosedComplaints():
     try:
-        db = get_connection()
+        db = get_db()
         cursor = db.cursor(dictionary=True)
         
         sql = """
@@ -249,20 +286,19 @@ def getRecentlyClosedComplaints():
 
 def getStaffAssignmentStats():
     try:
-        db = get_connection()
+        db = get_db()
         cursor = db.cursor(dictionary=True)
         
         sql = """
             SELECT u.id, CONCAT(u.first_name, ' ', u.last_name) AS staff, COUNT(c.id) AS assigned
             FROM users u
-            JOIN roles r ON u.role_id = r.id
             LEFT JOIN complaints c ON u.id = c.assigned_to
-            WHERE LOWER(r.name) = 'staff'
+            WHERE u.role_id = %s
             GROUP BY u.id
             ORDER BY assigned DESC, staff ASC
             LIMIT 20
         """
-        cursor.execute(sql)
+        cursor.execute(sql, (role_id("staff") or 0,))
         rows = cursor.fetchall()
         cursor.close()
         
@@ -280,7 +316,7 @@ def updateStaffStatus(id, data):
         if status not in ["Pending", "Rejected", "Authorized"]:
             return jsonify({"message": "Invalid or missing status"}), 400
 
-        conn = get_connection()
+        conn = get_db()
         cursor = conn.cursor()
         cursor.execute(
             "UPDATE users SET staff_status = %s WHERE id = %s",
@@ -292,6 +328,8 @@ def updateStaffStatus(id, data):
 
         if affected == 0:
             return jsonify({"message": "Staff not found"}), 404
+        invalidate_staff()
+        invalidate(USERS)
 
         return jsonify({"message": "Status updated", "id": id, "status": status})
 
@@ -305,99 +343,216 @@ def updateStaffStatus(id, data):
 # Delete user
 def deleteUser(id):
     try:
-        result = query_db("DELETE FROM users WHERE id = %s", (id,))
-        if result == []:
+        result = query_db("DELETE FROM users WHERE id = %s", (id,), commit=True)
+        if result == 0:
             return jsonify({"message": "User not found"}), 404
+        invalidate_staff()
+        invalidate(USERS)
         return jsonify({"message": "User deleted", "id": id})
     except Exception as err:
         return jsonify({"message": "Error deleting user", "error": str(err)}), 500
 
+# Complaints list query with the ?search= / ?role= / ?type= / ?status= filters,
+# shared by the list and export
+def _complaint_list_query():
+    search = request.args.get("search","")
+    role = request.args.get("role","")
+    type_ = request.args.get("type","")
+    status = request.args.get("status","")
+    found = complaint_search(search, ("u.first_name", "u.last_name", "c.subject", "c.id"))
+    # Rows come back already shaped as the response items
+    sql = f"""
+        SELECT c.id,
+               CONCAT(u.first_name, ' ', u.last_name) AS `user`,
+               r.name AS role,
+               c.type, c.subject, c.status,
+               c.created_at AS submitted,
+               c.updated_at AS updated,
+               IF(c.assigned_to IS NULL, '', CONCAT(au.first_name, ' ', au.last_name)) AS assignedTo
+               {found.columns}
+        FROM complaints c
+        {found.join}
+        JOIN users u ON c.user_id = u.id
+        JOIN roles r ON u.role_id = r.id
+        LEFT JOIN users au ON c.assigned_to = au.id
+        WHERE 1=1
+    """ + found.where
+    params = found.join_params + found.where_params
+    if role:
+        sql += " AND u.role_id = %s"
+        params.append(role_id(role) or 0)
+    if type_:
+        sql += " AND c.type = %s"
+        params.append(type_)
+    if status:
+        sql += " AND c.status = %s"
+        params.append(status)
+    return sql, params, found
+
 # Fetch complaints (with search/filter)
 def getComplaints():
     try:
-        search = request.args.get("search","")
-        role = request.args.get("role","")
-        type_ = request.args.get("type","")
-        status = request.args.get("status","")
-        sql = """
-            SELECT c.id, c.subject, c.type, c.status, c.description,
-                   c.created_at, c.updated_at, c.assigned_to,
-                   u.first_name, u.last_name, r.name AS user_role,
-                   au.first_name AS assigned_first, au.last_name AS assigned_last
-            FROM complaints c
-            JOIN users u ON c.user_id = u.id
-            JOIN roles r ON u.role_id = r.id
-            LEFT JOIN users au ON c.assigned_to = au.id
-            WHERE 1=1
-        """
-        params = []
-        if search:
-            sql += " AND (u.first_name LIKE %s OR u.last_name LIKE %s OR c.subject LIKE %s OR c.id LIKE %s)"
-            params.extend([f"%{search}%"]*4)
-        if role:
-            sql += " AND LOWER(r.name) = %s"
-            params.append(role.lower())
-        if type_:
-            sql += " AND c.type = %s"
-            params.append(type_)
-        if status:
-            sql += " AND c.status = %s"
-            params.append(status)
-        sql += " ORDER BY c.created_at DESC"
+        sql, params, found = _complaint_list_query()
+        keyset = RANKED_COMPLAINT_KEYSET if found.ranked else COMPLAINT_KEYSET
+        page = get_page_request()
+        sql, params = keyset.apply(sql, params, page)
         rows = query_db(sql, params)
-        complaints = [{
-            "id": r["id"],
-            "user": f"{r['first_name']} {r['last_name']}",
-            "role": r["user_role"],
-            "type": r["type"],
-            "subject": r["subject"],
-            "status": r["status"],
-            "submitted": r["created_at"],
-            "updated": r["updated_at"],
-            "assignedTo": f"{r['assigned_first']} {r['assigned_last']}" if r['assigned_to'] else ""
-        } for r in rows]
-        return jsonify(complaints)
+        return keyset.respond(rows, rows, page)
+    except InvalidPageRequest as err:
+        return jsonify({"message": str(err)}), 400
     except Exception as err:
         return jsonify({"message": "Error fetching complaints", "error": str(err)}), 500
 
+# Stream every matching complaint as CSV / NDJSON
+def exportComplaints():
+    try:
+        fmt = export_format()
+        sql, params, found = _complaint_list_query()
+        keyset = RANKED_COMPLAINT_KEYSET if found.ranked else COMPLAINT_KEYSET
+        return stream_query(sql, params, keyset, fmt, "complaints")
+    except InvalidExportRequest as err:
+        return jsonify({"message": str(err)}), 400
+    except Exception as err:
+        return jsonify({"message": "Error exporting complaints", "error": str(err)}), 500
+
+# Version of one complaint and its comments for ETag / Last-Modified.
+# updated_at only has second precision: the mutable columns themselves are
+# part of the version, so a status change and an assignment within the same
+# second still give different ETags.
+def complaintVersion(id):
+    rows = query_db("""
+        SELECT c.updated_at, c.status, c.assigned_to,
+               COUNT(ac.id) AS comments,
+               MAX(ac.id) AS last_comment_id,
+               MAX(ac.created_at) AS last_comment
+        FROM complaints c
+        LEFT JOIN admin_comments ac ON ac.complaint_id = c.id
+        WHERE c.id = %s
+        GROUP BY c.id, c.updated_at, c.status, c.assigned_to
+    """, (id,))
+    if not rows:
+        return None
+    row = rows[0]
+    stamps = [t for t in (row["updated_at"], row["last_comment"]) if t is not None]
+    fingerprint = (row["updated_at"], row["status"], row["assigned_to"],
+                   row["comments"], row["last_comment_id"], row["last_comment"])
+    return fingerprint, max(stamps) if stamps else None
+
+# Complaint detail query: the complaint with its user, role and assignee, and
+# (with_comments) its comments as one JSON array, so a detail costs a single
+# round trip. Callers append the WHERE / JOIN that picks the complaints.
+def _complaint_detail_query(with_comments):
+    sql = """
+        SELECT c.id, c.subject, c.description, c.type, c.status,
+               c.created_at, c.updated_at, c.assigned_to,
+               u.first_name, u.last_name, r.name AS user_role,
+               au.first_name AS assigned_first, au.last_name AS assigned_last
+    """
+    if with_comments:
+        # Same fields, in the same order, as models.rows.Comment
+        sql += """,
+               (SELECT JSON_ARRAYAGG(JSON_ARRAY(ac.id, ac.comment, ac.created_at, a.first_name, a.last_name))
+                FROM admin_comments ac
+                JOIN users a ON ac.admin_id = a.id
+                WHERE ac.complaint_id = c.id) AS comments
+        """
+    sql += """
+        FROM complaints c
+        JOIN users u ON c.user_id = u.id
+        JOIN roles r ON u.role_id = r.id
+        LEFT JOIN users au ON c.assigned_to = au.id
+    """
+    return sql
+
+def _detail_comments(value):
+    """Comment rows from the JSON_ARRAYAGG column, oldest first."""
+    if not value:
+        return []
+    # created_at is nullable; MySQL sorts NULL first, and so does ""
+    comments = sorted(map(Comment._make, json.loads(value)), key=lambda co: (co.created_at or "", co.id))
+    # JSON carries DATETIME / TIMESTAMP as "YYYY-MM-DD HH:MM:SS.ffffff"
+    return [{"id": co.id, "user": f"{co.first_name} {co.last_name}",
+             "date": datetime.fromisoformat(co.created_at) if co.created_at else None,
+             "msg": co.comment} for co in comments]
+
+def _complaint_detail(c, with_comments):
+    detail = {
+        "id": c["id"],
+        "user": f"{c['first_name']} {c['last_name']}",
+        "role": c["user_role"],
+        "subject": c["subject"],
+        "description": c["description"],
+        "type": c["type"],
+        "status": c["status"],
+        "submitted": c["created_at"],
+        "updated": c["updated_at"],
+        "assignedTo": f"{c['assigned_first']} {c['assigned_last']}" if c['assigned_to'] else ""
+    }
+    if with_comments:
+        detail["comments"] = _detail_comments(c["comments"])
+    return detail
+
 # Get complaint by ID
 def getComplaintById(id):
     try:
-        rows = query_db("""
-            SELECT c.*, u.first_name, u.last_name, r.name AS user_role,
-                   au.first_name AS assigned_first, au.last_name AS assigned_last
-            FROM complaints c
-            JOIN users u ON c.user_id = u.id
-            JOIN roles r ON u.role_id = r.id
-            LEFT JOIN users au ON c.assigned_to = au.id
-            WHERE c.id = %s
-        """, (id,))
+        sql = _complaint_detail_query(True)
+        sql += " WHERE c.id = %s"
+        rows = query_db(sql, (id,))
         if not rows:
             return jsonify({"message": "Complaint not found"}), 404
-        c = rows[0]
-        comments = query_db("""
-            SELECT ac.id, ac.comment, ac.created_at, a.first_name, a.last_name
-            FROM admin_comments ac
-            JOIN users a ON ac.admin_id = a.id
-            WHERE ac.complaint_id = %s
-            ORDER BY ac.created_at ASC
-        """, (id,))
-        return jsonify({
-            "id": c["id"],
-            "user": f"{c['first_name']} {c['last_name']}",
-            "role": c["user_role"],
-            "subject": c["subject"],
-            "description": c["description"],
-            "type": c["type"],
-            "status": c["status"],
-            "submitted": c["created_at"],
-            "updated": c["updated_at"],
-            "assignedTo": f"{c['assigned_first']} {c['assigned_last']}" if c['assigned_to'] else "",
-            "comments": [{"id": co["id"], "user": f"{co['first_name']} {co['last_name']}", "date": co["created_at"], "msg": co["comment"]} for co in comments]
-        })
+        return jsonify(_complaint_detail(rows[0], True))
     except Exception as err:
         return jsonify({"message": "Error fetching complaint", "error": str(err)}), 500
 
+def _requested_ids():
+    """?ids=1,2,3 as a list of distinct ids in request order (empty when absent)."""
+    raw = request.args.get("ids", "")
+    ids = []
+    for part in raw.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if not part.isdigit():
+            raise ValueError("ids must be a comma-separated list of complaint ids")
+        if int(part) not in ids:
+            ids.append(int(part))
+    return ids
+
+# Cache tags of a ?ids= batch: each complaint's detail tag, so a new comment evicts it
+def batchComplaintTags():
+    try:
+        return [complaint_tag(i) for i in _requested_ids()]
+    except ValueError:
+        return []
+
+# Details of several complaints (?ids=1,2,3[&include=comments]) for prefetching a table page
+def getComplaintsByIds():
+    try:
+        ids = _requested_ids()
+        if not ids:
+            return jsonify({"message": "ids must be a comma-separated list of complaint ids"}), 400
+        if len(ids) > MAX_LIMIT:
+            return jsonify({"message": f"At most {MAX_LIMIT} ids per request"}), 400
+        include = {part.strip() for part in request.args.get("include", "").split(",") if part.strip()}
+        if include - {"comments"}:
+            return jsonify({"message": "include supports only: comments"}), 400
+        with_comments = "comments" in include
+
+        sql = _complaint_detail_query(with_comments)
+        sql += """
+            JOIN JSON_TABLE(%s, '$[*]' COLUMNS (pos FOR ORDINALITY, id INT PATH '$')) AS wanted
+              ON wanted.id = c.id
+            ORDER BY wanted.pos
+        """
+        rows = query_db(sql, (json.dumps(ids),))
+        # In the requested order; unknown ids are left out
+        return jsonify([_complaint_detail(row, with_comments) for row in rows])
+    except ValueError as err:
+        return jsonify({"message": str(err)}), 400
+    except Exception as err:
+        return jsonify({"message": "Error fetching complaints", "error": str(err)}), 500
+
+
 # Update complaint status
 def updateComplaintStatus(id, data):
     try:
@@ -405,14 +560,17 @@ def updateComplaintStatus(id, data):
         if status not in ["Pending", "Solved", "Unsolved"]:
             return jsonify({"message": "Invalid or missing status"}), 400
 
-        result = query_db(
+        conn = get_db()
+        found = update_complaint(
+            conn, id,
             "UPDATE complaints SET status=%s, updated_at=NOW() WHERE id=%s",
-            (status, id),
-            commit=True  
+            (status, id)
         )
+        conn.commit()
 
-        if result == 0:
+        if not found:
             return jsonify({"message": "Complaint not found"}), 404
+        invalidate(COMPLAINTS, complaint_tag(id))
 
         return jsonify({"message": "Status updated", "id": id, "status": status})
     except Exception as err:
@@ -427,14 +585,17 @@ def assignComplaint(id, data):
         if not staff_id:
             return jsonify({"message": "Missing staff_id"}), 400
 
-        result = query_db(
+        conn = get_db()
+        found = update_complaint(
+            conn, id,
             "UPDATE complaints SET assigned_to=%s, updated_at=NOW() WHERE id=%s",
-            (staff_id, id),
-            commit=True
+            (staff_id, id)
         )
+        conn.commit()
 
-        if result == 0:
+        if not found:
             return jsonify({"message": "Complaint not found"}), 404
+        invalidate(COMPLAINTS, complaint_tag(id))
 
         return jsonify({"message": "Assigned", "id": id, "staff_id": staff_id})
     except Exception as err:
@@ -442,16 +603,17 @@ def assignComplaint(id, data):
 
 
 # Add admin comment
-def addAdminComment(id):
+def addAdminComment(id, data):
     try:
-        comment = request.json.get("comment")
-        adminId = getattr(request, "user", {}).get("id")
+        comment = data.get("comment") if data else None
+        adminId = g.user.get("id") if g.user else None
         if not comment or not comment.strip():
             return jsonify({"message": "Empty comment"}), 400
         if not adminId:
             return jsonify({"message": "Unauthorized: Admin ID missing"}), 401
         query_db("INSERT INTO admin_comments (complaint_id, admin_id, comment, created_at) VALUES (%s,%s,%s,NOW())",
-                 (id, adminId, comment))
+                 (id, adminId, comment), commit=True)
+        invalidate(complaint_tag(id))
         return jsonify({"message": "Comment added"})
     except Exception as err:
         return jsonify({"message": "Error adding comment", "error": str(err)}), 500
@@ -459,14 +621,21 @@ def addAdminComment(id):
 # Delete complaint
 def deleteComplaint(id):
     try:
-        result = query_db(
+        conn = get_db()
+        attachment = query_db("SELECT attachment_id FROM complaints WHERE id=%s", (id,))
+        found = update_complaint(
+            conn, id,
             "DELETE FROM complaints WHERE id=%s",
-            (id,),
-            commit=True  
+            (id,)
         )
+        conn.commit()
 
-        if result == 0: 
+        if not found:
             return jsonify({"message": "Complaint not found"}), 404
+        invalidate(COMPLAINTS, complaint_tag(id))
+        # The file may be shared with other complaints; the job checks
+        if attachment and attachment[0]["attachment_id"]:
+            enqueue("attachment.release", {"attachment_id": attachment[0]["attachment_id"]})
 
         return jsonify({"message": "Complaint deleted", "id": id}), 200
     except Exception as err:
@@ -476,13 +645,16 @@ def deleteComplaint(id):
 # Get authorized staff list
 def getAuthorizedStaff():
     try:
-        rows = query_db("""
-            SELECT u.id, CONCAT(u.first_name,' ',u.last_name) AS name
-            FROM users u
-            JOIN roles r ON u.role_id=r.id
-            WHERE LOWER(r.name)='staff' AND u.staff_status='Authorized'
-            ORDER BY u.first_name
-        """)
-        return jsonify(rows)
+        return jsonify(authorized_staff())
     except Exception as err:
         return jsonify({"message": "Error fetching staff list", "error": str(err)}), 500
+
+
+# Live connection pool stats
+def getPoolStats():
+    return jsonify(get_pool_stats())
+
+
+# Response cache hit ratio
+def getCacheStats():
+    return jsonify(response_cache.stats())
@@ -1,10 +1,12 @@
 # controllers/authController.py
 import os
-import bcrypt
 import jwt
 from flask import request, jsonify
 from datetime import datetime, timedelta
-from config.db import get_connection 
+from config.db import get_db 
+from services.passwords import PasswordBusy, hash_password, check_password, needs_rehash
+from services.referenceData import role_id as lookup_role_id
+from services.responseCache import invalidate, USERS
 
 # --- Ensure JWT_SECRET exists ---
 JWT_SECRET = os.getenv("JWT_SECRET")
@@ -13,7 +15,6 @@ if not JWT_SECRET:
 
 # ========== REGISTER USER OR STAFF ==========
 def registerUser():
-    conn = None
     cursor = None
     try:
         data = request.get_json()
@@ -30,15 +31,13 @@ def registerUser():
 
         name = f"{first_name} {last_name}"
 
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-
         # Find role_id
-        cursor.execute("SELECT id FROM roles WHERE LOWER(name) = %s", (role.lower(),))
-        role_row = cursor.fetchone()
-        if not role_row:
+        role_id = lookup_role_id(role)
+        if not role_id:
             return jsonify({"message": "Invalid role specified."}), 400
-        role_id = role_row["id"]
+
+        conn = get_db()
+        cursor = conn.cursor(dictionary=True)
 
         # Check for duplicate email
         cursor.execute("SELECT * FROM users WHERE email = %s", (email,))
@@ -46,7 +45,7 @@ def registerUser():
             return jsonify({"message": "Email already registered. Please log in."}), 409
 
         # Hash password
-        hashed_password = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+        hashed_password = hash_password(password)
 
         # Staff requires admin approval, users auto-approved
         is_approved = False if role.lower() == "staff" else True
@@ -62,6 +61,8 @@ def registerUser():
         )
         conn.commit()
         new_user_id = cursor.lastrowid
+        # New row in the admin user list and dashboard totals
+        invalidate(USERS)
 
         # Staff response
         if role.lower() == "staff":
@@ -90,19 +91,38 @@ def registerUser():
             "user": user_profile
         }), 201
 
+    except PasswordBusy:
+        return jsonify({"message": "Server busy, please try again shortly."}), 503, {"Retry-After": "2"}
     except Exception as e:
         print("REGISTER USER ERROR:", e)  # Railway log
         return jsonify({"message": "Registration failed.", "error": str(e)}), 500
     finally:
         if cursor:
             cursor.close()
-        if conn:
-            conn.close()
+
+
+# ========== REHASH ON LOGIN ==========
+def rehash_password(conn, user_id, old_hash, password):
+    """Replace old_hash unless the password changed meanwhile; best effort."""
+    cursor = None
+    try:
+        new_hash = hash_password(password)
+        cursor = conn.cursor()
+        cursor.execute(
+            "UPDATE users SET password = %s WHERE id = %s AND password = %s",
+            (new_hash, user_id, old_hash)
+        )
+        conn.commit()
+    except Exception as e:
+        # The login already succeeded; try again next time
+        print("REHASH PASSWORD ERROR:", e)
+    finally:
+        if cursor:
+            cursor.close()
 
 
 # ========== LOGIN USER, STAFF, OR ADMIN ==========
 def loginUser():
-    conn = None
     cursor = None
     try:
         data = request.get_json()
@@ -112,8 +132,9 @@ def loginUser():
         if not (email and password):
             return jsonify({"message": "Email and password are required."}), 400
 
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
+        conn = get_db()
+        # Buffered: the connection may run a rehash UPDATE before this cursor closes
+        cursor = conn.cursor(dictionary=True, buffered=True)
 
         cursor.execute(
             """
@@ -138,9 +159,13 @@ def loginUser():
                 return jsonify({"message": "Your staff account was rejected by admin."}), 403
 
         # Verify password
-        if not bcrypt.checkpw(password.encode("utf-8"), user["password"].encode("utf-8")):
+        if not check_password(password, user["password"]):
             return jsonify({"message": "Incorrect password."}), 401
 
+        # Bring the stored hash to the configured cost (BCRYPT_ROUNDS)
+        if needs_rehash(user["password"]):
+            rehash_password(conn, user["id"], user["password"], password)
+
         # Generate access & refresh tokens
         access_token = jwt.encode(
             {"id": user["id"], "role": user["role"], "exp": datetime.utcnow() + timedelta(minutes=30)},
@@ -169,11 +194,11 @@ def loginUser():
             }
         }), 200
 
+    except PasswordBusy:
+        return jsonify({"message": "Server busy, please try again shortly."}), 503, {"Retry-After": "2"}
     except Exception as e:
         print("LOGIN USER ERROR:", e)  # Railway log
         return jsonify({"message": "Login failed", "error": str(e)}), 500
     finally:
         if cursor:
             cursor.close()
-        if conn:
-            conn.close()
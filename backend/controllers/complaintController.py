@@ -1,21 +1,62 @@
 # controllers/complaint_controller.py
 
-from flask import request, jsonify, g
-from config.db import get_connection
 import os
+from flask import request, jsonify, g, send_file, send_from_directory
+from config.db import get_db
+from services.complaintCounters import record_insert, record_inserts
+from services.groupCommit import GroupCommit, GroupCommitTimeout, GROUP_COMMIT
+from services.pagination import Keyset, InvalidPageRequest, get_page_request
+from services.responseCache import invalidate, COMPLAINTS
+from services.attachments import (
+    read_upload, save_attachment, abandon_placed, path_for, inline_type,
+    UploadTooLarge, InvalidUpload, ATTACHMENT_DIR
+)
+
+# Sort key for the user's complaint lists
+COMPLAINT_KEYSET = Keyset(("created_at", "created_at"), ("id", "id"))
+
+
+def _insert_complaints(conn, rows):
+    """Insert (user_id, subject, type, description) rows; returns their ids. The caller commits."""
+    # One INSERT per row: each lastrowid is exact whatever the auto-increment
+    # settings or concurrent inserts, and the batch still shares one commit
+    ids = []
+    cursor = conn.cursor()
+    try:
+        for row in rows:
+            cursor.execute(
+                "INSERT INTO complaints (user_id, subject, type, description, status) VALUES (%s, %s, %s, %s, 'Unsolved')",
+                row
+            )
+            ids.append(cursor.lastrowid)
+    finally:
+        cursor.close()
+    record_inserts(conn, ids)
+    return ids
+
+
+# GROUP_COMMIT=1: submissions without an attachment share transactions
+# (an attachment's row lock has to be held by its own complaint's transaction)
+complaint_writes = GroupCommit("complaints", _insert_complaints)
 
 # =========================================================
 # ADD NEW COMPLAINT
 # =========================================================
 def addComplaint():
+    stored = None
     try:
         # 1️⃣ Get logged-in user ID from JWT
         user_id = g.user["id"]
 
-        # 2️⃣ Read form fields (MUST match DB columns)
-        subject = request.form.get("subject")
-        type_ = request.form.get("type")
-        description = request.form.get("description")
+        # 2️⃣ Read form fields (MUST match DB columns); an attachment is
+        # streamed into the attachment store while the body is parsed
+        if request.mimetype == "multipart/form-data":
+            form, stored = read_upload("attachment")
+        else:
+            form = request.form
+        subject = form.get("subject")
+        type_ = form.get("type")
+        description = form.get("description")
 
         # 3️⃣ Validate required fields (PREVENTS 500)
         if not subject or not type_ or not description:
@@ -23,45 +64,110 @@ def addComplaint():
                 "message": "Subject, type, and description are required"
             }), 400
 
-        # 4️⃣ Handle optional attachment
-        attachment = None
-        if "attachment" in request.files:
-            file = request.files["attachment"]
-
-            if file and file.filename:
-                attachment = file.filename
-                os.makedirs("uploads", exist_ok=True)
-                file.save(os.path.join("uploads", attachment))
+        # 4️⃣ Insert into Railway MySQL database
+        if GROUP_COMMIT and not stored:
+            complaint_id = complaint_writes.submit((user_id, subject, type_, description))
+            invalidate(COMPLAINTS)
+            return jsonify({
+                "message": "Complaint submitted successfully!",
+                "id": complaint_id
+            }), 201
 
-        # 5️⃣ Insert into Railway MySQL database
-        conn = get_connection()
+        conn = get_db()
         cursor = conn.cursor()
 
+        # 5️⃣ Optional attachment: one attachments row per distinct content,
+        # locked before its file is placed (see services/attachments.py)
+        attachment, attachment_id = None, None
+        if stored:
+            attachment = stored.filename
+            attachment_id = save_attachment(cursor, stored)
+            stored.place()
+
         cursor.execute(
             """
             INSERT INTO complaints
-                (user_id, subject, type, description, attachment, status)
+                (user_id, subject, type, description, attachment, attachment_id, status)
             VALUES
-                (%s, %s, %s, %s, %s, %s)
+                (%s, %s, %s, %s, %s, %s, %s)
             """,
-            (user_id, subject, type_, description, attachment, "Unsolved")
+            (user_id, subject, type_, description, attachment, attachment_id, "Unsolved")
         )
+        complaint_id = cursor.lastrowid
+        record_insert(conn, complaint_id)
 
         conn.commit()
         cursor.close()
-        conn.close()
+        invalidate(COMPLAINTS)
 
         # 6️⃣ Success response
         return jsonify({
-            "message": "Complaint submitted successfully!"
+            "message": "Complaint submitted successfully!",
+            "id": complaint_id
         }), 201
 
+    except GroupCommitTimeout as e:
+        if e.in_flight:
+            return jsonify({
+                "message": "Complaint received; it is still being saved. Check your complaints before resubmitting."
+            }), 202
+        response = jsonify({"message": "Server is busy; the complaint was not saved. Please try again."})
+        response.headers["Retry-After"] = "5"
+        return response, 503
+    except UploadTooLarge as e:
+        return jsonify({"message": str(e)}), 413
+    except InvalidUpload as e:
+        return jsonify({"message": str(e)}), 400
     except Exception as e:
+        if stored and stored.placed:
+            # The attachments row rolled back with the complaint; its file may now be unreferenced
+            try:
+                get_db().rollback()
+            except Exception:
+                pass
+            abandon_placed(stored)
         # 7️⃣ Clear error response (helps debugging)
         return jsonify({
             "message": "Could not submit complaint",
             "error": str(e)
         }), 500
+    finally:
+        if stored:
+            stored.discard()  # no-op once placed
+
+
+# =========================================================
+# LIST VERSIONS (ETag / Last-Modified, see services/conditionalGet.py)
+# =========================================================
+def _user_list_version(sql):
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute(sql, (g.user["id"],))
+        row = cursor.fetchone()
+    finally:
+        cursor.close()
+    return (row["total"], row["last_modified"], row["last_id"], row["members"]), row["last_modified"]
+
+
+# updated_at only has second precision: the members checksum catches a row
+# leaving and another returning within the same second
+def userUnsolvedVersion():
+    return _user_list_version("""
+        SELECT COUNT(*) AS total, MAX(updated_at) AS last_modified, MAX(id) AS last_id,
+               BIT_XOR(CRC32(id)) AS members
+        FROM complaints
+        WHERE user_id = %s AND status = 'Unsolved'
+    """)
+
+
+def userSolvedVersion():
+    return _user_list_version("""
+        SELECT COUNT(*) AS total, MAX(updated_at) AS last_modified, MAX(id) AS last_id,
+               BIT_XOR(CRC32(id)) AS members
+        FROM complaints
+        WHERE user_id = %s AND status = 'Solved'
+    """)
 
 
 # =========================================================
@@ -71,10 +177,8 @@ def getUserUnsolvedComplaints():
     try:
         user_id = g.user["id"]
 
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-
-        cursor.execute(
+        page = get_page_request()
+        sql, params = COMPLAINT_KEYSET.apply(
             """
             SELECT
                 id,
@@ -87,18 +191,23 @@ def getUserUnsolvedComplaints():
             FROM complaints
             WHERE user_id = %s
               AND status = 'Unsolved'
-            ORDER BY created_at DESC
             """,
-            (user_id,)
+            (user_id,),
+            page
         )
 
+        conn = get_db()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(sql, params)
+
         complaints = cursor.fetchall()
 
         cursor.close()
-        conn.close()
 
-        return jsonify(complaints), 200
+        return COMPLAINT_KEYSET.respond(complaints, complaints, page), 200
 
+    except InvalidPageRequest as e:
+        return jsonify({"message": str(e)}), 400
     except Exception as e:
         return jsonify({
             "message": "Unable to fetch complaints",
@@ -113,10 +222,8 @@ def getUserSolvedComplaints():
     try:
         user_id = g.user["id"]
 
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-
-        cursor.execute(
+        page = get_page_request()
+        sql, params = COMPLAINT_KEYSET.apply(
             """
             SELECT
                 id,
@@ -129,20 +236,96 @@ def getUserSolvedComplaints():
             FROM complaints
             WHERE user_id = %s
               AND status = 'Solved'
-            ORDER BY created_at DESC
             """,
-            (user_id,)
+            (user_id,),
+            page
         )
 
+        conn = get_db()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(sql, params)
+
         complaints = cursor.fetchall()
 
         cursor.close()
-        conn.close()
 
-        return jsonify(complaints), 200
+        return COMPLAINT_KEYSET.respond(complaints, complaints, page), 200
 
+    except InvalidPageRequest as e:
+        return jsonify({"message": str(e)}), 400
     except Exception as e:
         return jsonify({
             "message": "Unable to fetch solved complaints",
             "error": str(e)
         }), 500
+
+
+# =========================================================
+# DOWNLOAD A COMPLAINT'S ATTACHMENT
+# =========================================================
+# Stored files never change (the path is the content hash), so browsers
+# may keep them for a year without revalidating; "private" because the
+# response needs a login.
+ATTACHMENT_CACHE_SECONDS = 365 * 24 * 3600
+
+
+def getComplaintAttachment(id):
+    try:
+        conn = get_db()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(
+            """
+            SELECT c.user_id, c.attachment, a.sha256, a.mime_type
+            FROM complaints c
+            LEFT JOIN attachments a ON c.attachment_id = a.id
+            WHERE c.id = %s
+            """,
+            (id,)
+        )
+        row = cursor.fetchone()
+        cursor.close()
+
+        # Users see their own complaints' files; staff and admins see all
+        role = str(g.user.get("role", "")).lower()
+        if not row or (role not in ("admin", "staff") and row["user_id"] != g.user.get("id")):
+            return jsonify({"message": "Complaint not found"}), 404
+        if not row["attachment"]:
+            return jsonify({"message": "Complaint has no attachment"}), 404
+
+        if row["sha256"] is None:
+            # Uploaded before the content-addressed store: saved under its
+            # own name, which a later upload may have replaced
+            response = send_from_directory(
+                os.path.abspath(ATTACHMENT_DIR), row["attachment"],
+                as_attachment=True, conditional=True, max_age=0
+            )
+            response.headers["X-Content-Type-Options"] = "nosniff"
+            return response
+
+        path = os.path.abspath(path_for(row["sha256"]))
+        if not os.path.isfile(path):
+            return jsonify({"message": "Attachment file is missing"}), 404
+
+        # conditional=True answers If-None-Match with 304 and Range with 206;
+        # the body goes out through the server's file wrapper (sendfile)
+        response = send_file(
+            path,
+            mimetype=row["mime_type"],
+            as_attachment=not inline_type(row["mime_type"]),
+            download_name=row["attachment"],
+            conditional=True,
+            etag=row["sha256"],
+            max_age=ATTACHMENT_CACHE_SECONDS
+        )
+        response.cache_control.public = False
+        response.cache_control.private = True
+        response.cache_control.immutable = True
+        response.accept_ranges = "bytes"
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        return response
+
+    except Exception as e:
+        return jsonify({
+            "message": "Unable to fetch attachment",
+            "error": str(e)
+        }), 500
@@ -1,6 +1,20 @@
 # staffController.py
 from flask import request, jsonify, g
-from config.db import get_connection
+from config.db import get_db
+from services.statsService import complaint_summary
+from services.complaintCounters import update_complaint
+from services.pagination import Keyset, InvalidPageRequest, get_page_request
+from services.search import complaint_search
+from services.responseCache import invalidate, COMPLAINTS, complaint_tag
+from services.singleFlight import coalesce
+from models.rows import Complaint
+from models.fetch import fetch_all
+
+# Sort keys for the paginated lists (RANKED_* when a fulltext search is active)
+# allComplaints selects c.created_at under its response name, "issued"
+COMPLAINT_KEYSET = Keyset(("c.created_at", "issued"), ("c.id", "id"))
+RANKED_COMPLAINT_KEYSET = Keyset(("s.relevance", "relevance"), ("c.id", "id"), hidden=("relevance",))
+SOLVED_KEYSET = Keyset(("c.updated_at", "updated_at"), ("c.id", "id"))
 
 
 # Get the current staff user's profile (for sidebar/navbar)
@@ -10,7 +24,7 @@ def getProfile():
         if not staff_id:
             return jsonify({"message": "Unauthorized, no staff ID"}), 401
 
-        conn = get_connection()
+        conn = get_db()
         cursor = conn.cursor(dictionary=True)
 
         cursor.execute(
@@ -19,7 +33,6 @@ def getProfile():
         )
         row = cursor.fetchone()
         cursor.close()
-        conn.close()
 
         if not row:
             return jsonify({"message": "Staff not found"}), 404
@@ -36,49 +49,29 @@ def getProfile():
 
 
 # Dashboard statistics and chart data for staff dashboard
-def getComplaintStats():
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-
-        # Total complaints
-        cursor.execute("SELECT COUNT(*) AS total FROM complaints")
-        total = cursor.fetchone()["total"]
-
-        # Unsolved complaints
-        cursor.execute("SELECT COUNT(*) AS unsolved FROM complaints WHERE status = 'Unsolved'")
-        unsolved = cursor.fetchone()["unsolved"]
-
-        # Solved complaints
-        cursor.execute("SELECT COUNT(*) AS solved FROM complaints WHERE status = 'Solved'")
-        solved = cursor.fetchone()["solved"]
-
-        # Pending complaints
-        cursor.execute("SELECT COUNT(*) AS pending FROM complaints WHERE status = 'Pending'")
-        pending = cursor.fetchone()["pending"]
-
-        # Complaints grouped by type
-        cursor.execute("""
-            SELECT type,
-                   SUM(status = 'Unsolved') AS unsolved,
-                   SUM(status = 'Pending') AS pending,
-                   SUM(status = 'Solved') AS solved,
-                   COUNT(*) AS total
-            FROM complaints
-            GROUP BY type
-        """)
-        by_type = cursor.fetchall()
+@coalesce("staff.complaint_stats")
+def _complaint_stats():
+    summary = complaint_summary()
+    return {
+        "total": summary["total"],
+        "unsolved": summary["unsolved"],
+        "pending": summary["pending"],
+        "solved": summary["solved"],
+        "byType": [
+            {
+                "type": t["type"],
+                "unsolved": t["unsolved"],
+                "pending": t["pending"],
+                "solved": t["solved"],
+                "total": t["total"]
+            } for t in summary["byType"]
+        ]
+    }
 
-        cursor.close()
-        conn.close()
 
-        return jsonify({
-            "total": total,
-            "unsolved": unsolved,
-            "pending": pending,
-            "solved": solved,
-            "byType": by_type
-        })
+def getComplaintStats():
+    try:
+        return jsonify(_complaint_stats())
 
     except Exception as err:
         return jsonify({
@@ -94,56 +87,45 @@ def allComplaints():
         if not staff_id:
             return jsonify({"message": "Unauthorized"}), 401
 
-        conn = get_connection()
+        conn = get_db()
         cursor = conn.cursor(dictionary=True)
 
         search = request.args.get("search", "")
         complaint_type = request.args.get("type", "")
 
-        sql = """
-            SELECT c.id, c.subject, c.type, c.description, c.status,
-                   c.created_at, c.user_id, u.first_name, u.last_name
+        found = complaint_search(search, ("u.first_name", "u.last_name", "c.subject", "c.type"))
+        # Rows come back already shaped as the response items
+        sql = f"""
+            SELECT c.id,
+                   CONCAT(u.first_name, ' ', u.last_name) AS `user`,
+                   c.subject, c.type,
+                   c.created_at AS issued,
+                   c.description AS `desc`,
+                   c.status
+                   {found.columns}
             FROM complaints c
+            {found.join}
             JOIN users u ON c.user_id = u.id
             WHERE 1=1
-        """
-        params = []
-
-        if search:
-            sql += """
-                AND (u.first_name LIKE %s OR
-                     u.last_name  LIKE %s OR
-                     c.subject    LIKE %s OR
-                     c.type       LIKE %s)
-            """
-            search_pattern = f"%{search}%"
-            params.extend([search_pattern]*4)
+        """ + found.where
+        params = found.join_params + found.where_params
 
         if complaint_type:
             sql += " AND c.type = %s"
             params.append(complaint_type)
 
-        sql += " ORDER BY c.created_at DESC"
+        keyset = RANKED_COMPLAINT_KEYSET if found.ranked else COMPLAINT_KEYSET
+        page = get_page_request()
+        sql, params = keyset.apply(sql, params, page)
 
         cursor.execute(sql, params)
         rows = cursor.fetchall()
         cursor.close()
-        conn.close()
 
-        complaints = [
-            {
-                "id": row["id"],
-                "user": f"{row['first_name']} {row['last_name']}",
-                "subject": row["subject"],
-                "type": row["type"],
-                "issued": row["created_at"],
-                "desc": row["description"],
-                "status": row["status"]
-            } for row in rows
-        ]
-
-        return jsonify(complaints)
+        return keyset.respond(rows, rows, page)
 
+    except InvalidPageRequest as err:
+        return jsonify({"message": str(err)}), 400
     except Exception as err:
         return jsonify({
             "message": "Error fetching complaints",
@@ -151,6 +133,36 @@ def allComplaints():
         }), 500
 
 
+# Version of the filtered list for ETag / Last-Modified (services/conditionalGet.py).
+# updated_at only has second precision, so the displayed status is checksummed too.
+def allComplaintsVersion():
+    search = request.args.get("search", "")
+    complaint_type = request.args.get("type", "")
+
+    found = complaint_search(search, ("u.first_name", "u.last_name", "c.subject", "c.type"))
+    sql = f"""
+        SELECT COUNT(*) AS total, MAX(c.updated_at) AS last_modified, MAX(c.id) AS last_id,
+               BIT_XOR(CRC32(CONCAT_WS(',', c.id, c.status))) AS statuses
+        FROM complaints c
+        {found.join}
+        JOIN users u ON c.user_id = u.id
+        WHERE 1=1
+    """ + found.where
+    params = found.join_params + found.where_params
+
+    if complaint_type:
+        sql += " AND c.type = %s"
+        params.append(complaint_type)
+
+    cursor = get_db().cursor(dictionary=True)
+    try:
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+    finally:
+        cursor.close()
+    return (row["total"], row["last_modified"], row["last_id"], row["statuses"]), row["last_modified"]
+
+
 # Update/change complaint status (Pending, Solved, Unsolved)
 def updateComplaintStatus(id, data):
     try:
@@ -162,19 +174,17 @@ def updateComplaintStatus(id, data):
         if status not in ["Pending", "Solved", "Unsolved"]:
             return jsonify({"message": "Invalid or missing status"}), 400
 
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
+        conn = get_db()
+        found = update_complaint(
+            conn, id,
             "UPDATE complaints SET status = %s WHERE id = %s",
             (status, id)
         )
         conn.commit()
-        affected = cursor.rowcount
-        cursor.close()
-        conn.close()
 
-        if affected == 0:
+        if not found:
             return jsonify({"message": "Complaint not found"}), 404
+        invalidate(COMPLAINTS, complaint_tag(id))
 
         return jsonify({"message": "Status updated", "id": id, "status": status})
 
@@ -192,37 +202,35 @@ def getAllSolvedComplaints():
         if not staff_id:
             return jsonify({"message": "Unauthorized"}), 401
 
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-
-        cursor.execute("""
+        page = get_page_request()
+        sql, params = SOLVED_KEYSET.apply("""
             SELECT c.id, u.first_name, u.last_name,
                    c.subject, c.type, c.description,
                    c.status, c.created_at, c.updated_at
             FROM complaints c
             JOIN users u ON c.user_id = u.id
             WHERE c.status = 'Solved'
-            ORDER BY c.updated_at DESC
-        """)
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        """, [], page)
+
+        rows = fetch_all(Complaint, sql, params)
 
         complaints = [
             {
-                "id": row["id"],
-                "user": f"{row['first_name']} {row['last_name']}",
-                "subject": row["subject"],
-                "type": row["type"],
-                "issuedDate": row["created_at"],
-                "solvedDate": row["updated_at"],
-                "description": row["description"],
-                "status": row["status"]
+                "id": row.id,
+                "user": f"{row.first_name} {row.last_name}",
+                "subject": row.subject,
+                "type": row.type,
+                "issuedDate": row.created_at,
+                "solvedDate": row.updated_at,
+                "description": row.description,
+                "status": row.status
             } for row in rows
         ]
 
-        return jsonify(complaints)
+        return SOLVED_KEYSET.respond(complaints, rows, page)
 
+    except InvalidPageRequest as err:
+        return jsonify({"message": str(err)}), 400
     except Exception as err:
         return jsonify({
             "message": "Error fetching solved complaints",
@@ -1,14 +1,13 @@
 # controllers/usercontroller.py
 from flask import jsonify, g
-from config.db import get_connection
+from models.rows import User
+from models.fetch import fetch_one
 
 def get_user_profile():
     try:
         user_id = g.user["id"]  
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-        
-        cursor.execute(
+        row = fetch_one(
+            User,
             """
             SELECT name AS username, email, first_name, last_name, college, roll_number, branch 
             FROM users 
@@ -16,12 +15,10 @@ def get_user_profile():
             """,
             (user_id,)
         )
-        row = cursor.fetchone()
-        cursor.close()
         
         if not row:
             return jsonify({"message": "No user found"}), 404
 
-        return jsonify(row)
+        return jsonify(row._asdict())
     except Exception as err:
         return jsonify({"message": "Error loading profile", "error": str(err)}), 500
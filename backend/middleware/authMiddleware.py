@@ -1,30 +1,102 @@
 # middleware/authmiddleware.py
 import os
+import time
+import hashlib
+import threading
 import jwt
+from collections import OrderedDict
 from functools import wraps
 from flask import request, jsonify, g
 
+from services import metrics
+
 JWT_SECRET = os.getenv("JWT_SECRET", "your_default_secret")
+JWT_LEEWAY = 300
+# Verified tokens kept in memory (per worker); 0 disables the cache
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "1024"))
+
+class TokenCache:
+    """LRU of verified claims keyed by token digest.
+
+    An entry lives until the token's exp plus JWT_LEEWAY - the same moment
+    jwt.decode() would start rejecting it - so a hit skips the signature
+    check without extending any token's life. Tokens without exp are not
+    cached.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # digest -> (claims, valid_until)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, digest):
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None and entry[1] > time.time():
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                metrics.token_cache_total.inc(1, "hit")
+                return entry[0]
+            if entry is not None:
+                del self._entries[digest]
+            self.misses += 1
+        metrics.token_cache_total.inc(1, "miss")
+        return None
+
+    def put(self, digest, claims):
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)):
+            return
+        with self._lock:
+            self._entries[digest] = (claims, exp + JWT_LEEWAY)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "capacity": self.size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRatio": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+token_cache = TokenCache(TOKEN_CACHE_SIZE)
+
+def decode_token(token):
+    """Verified JWT payload; raises jwt.InvalidTokenError (or ExpiredSignatureError)."""
+    if not TOKEN_CACHE_SIZE:
+        return jwt.decode(token, JWT_SECRET, algorithms=["HS256"], leeway=JWT_LEEWAY)
+
+    digest = hashlib.sha256(token.encode("utf-8")).digest()
+    claims = token_cache.get(digest)
+    if claims is None:
+        claims = jwt.decode(token, JWT_SECRET, algorithms=["HS256"], leeway=JWT_LEEWAY)
+        token_cache.put(digest, claims)
+    # Callers get their own copy; the cached claims stay pristine
+    return dict(claims)
+
+def bearer_token():
+    auth_header = request.headers.get("Authorization")
+    if auth_header and auth_header.startswith("Bearer "):
+        return auth_header.split(" ")[1]
+    return None
 
 def authenticate_token(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        auth_header = request.headers.get("Authorization")
-        token = None
-
-        if auth_header and auth_header.startswith("Bearer "):
-            token = auth_header.split(" ")[1]
+        token = bearer_token()
 
         if not token:
             return jsonify({"message": "Unauthorized"}), 401
 
         try:
-            user = jwt.decode(
-                token,
-                JWT_SECRET,
-                algorithms=["HS256"],
-                leeway=300  
-            )
+            user = decode_token(token)
             g.user = user
         except jwt.ExpiredSignatureError:
             return jsonify({"message": "Token expired"}), 403
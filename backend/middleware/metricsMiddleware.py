@@ -0,0 +1,53 @@
+# middleware/metricsMiddleware.py
+import os
+import time
+import hmac
+from flask import request, g, jsonify, Response
+
+from middleware.authMiddleware import authenticate_token
+from services import metrics
+
+# Scrapers send "Authorization: Bearer <METRICS_TOKEN>"; without it set,
+# /api/metrics falls back to requiring an admin JWT.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+
+def _start_timer():
+    g.request_started = time.perf_counter()
+
+
+def _record(response):
+    started = g.pop("request_started", None)
+    if started is not None:
+        # Endpoint names ("admin.get_statistics") keep label cardinality bounded;
+        # unmatched URLs are grouped instead of labelled by raw path.
+        endpoint = request.endpoint or "unmatched"
+        metrics.http_request_duration.observe(time.perf_counter() - started, endpoint, request.method)
+        metrics.http_requests_total.inc(1, endpoint, request.method, str(response.status_code))
+    return response
+
+
+def _render():
+    return Response(metrics.registry.render(), mimetype="text/plain; version=0.0.4")
+
+
+@authenticate_token
+def _admin_metrics():
+    if str(g.user.get("role", "")).lower() != "admin":
+        return jsonify({"message": "Forbidden"}), 403
+    return _render()
+
+
+def metrics_view():
+    if METRICS_TOKEN:
+        supplied = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(supplied, "Bearer " + METRICS_TOKEN):
+            return jsonify({"message": "Unauthorized"}), 401
+        return _render()
+    return _admin_metrics()
+
+
+def init_app(app):
+    app.before_request(_start_timer)
+    app.after_request(_record)
+    app.add_url_rule("/api/metrics", "metrics", metrics_view, methods=["GET"])
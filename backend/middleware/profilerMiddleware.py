@@ -0,0 +1,107 @@
+# middleware/profilerMiddleware.py
+#
+# Opt-in sampling profiler for single requests. An admin sends
+#   X-Profile: 1
+# with their usual Bearer token; a background thread samples the request
+# thread's stack every PROFILE_INTERVAL_MS and, when the request finishes,
+# writes the samples in collapsed-stack format (one "a;b;c count" line per
+# stack) to PROFILE_DIR. Feed the file to flamegraph.pl or speedscope.
+# The file name comes back in the X-Profile-File response header.
+import os
+import re
+import sys
+import time
+import threading
+from collections import Counter
+from flask import request, g
+
+from middleware.authMiddleware import bearer_token, decode_token
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join("logs", "profiles"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+# Hard stop so a forgotten header on a long export cannot sample forever
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "30"))
+
+
+def _frame_name(frame):
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}.{frame.f_code.co_name}"
+
+
+class StackSampler:
+    """Samples one thread's Python stack on a timer."""
+
+    def __init__(self, thread_id, interval=PROFILE_INTERVAL_MS / 1000.0):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+        return self
+
+    def _run(self):
+        deadline = time.monotonic() + PROFILE_MAX_SECONDS
+        while not self._stop.wait(self.interval) and time.monotonic() < deadline:
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                names.append(_frame_name(frame))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+            self.samples += 1
+
+    def collapsed(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _is_admin():
+    token = bearer_token()
+    if not token:
+        return False
+    try:
+        return str(decode_token(token).get("role", "")).lower() == "admin"
+    except Exception:
+        return False
+
+
+def _start():
+    if request.headers.get(PROFILE_HEADER) != "1" or not _is_admin():
+        return
+    g.profiler = StackSampler(threading.get_ident()).start()
+
+
+def _finish(response):
+    sampler = g.pop("profiler", None)
+    if sampler is None:
+        return response
+    sampler.stop()
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    endpoint = re.sub(r"[^\w.-]", "_", request.endpoint or "unmatched")
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{endpoint}-{os.getpid()}-{threading.get_ident()}.folded"
+    with open(os.path.join(PROFILE_DIR, name), "w", encoding="utf-8") as f:
+        f.write(sampler.collapsed())
+
+    response.headers["X-Profile-File"] = name
+    response.headers["X-Profile-Samples"] = str(sampler.samples)
+    response.headers["X-Profile-Seconds"] = f"{sampler.elapsed:.3f}"
+    return response
+
+
+def init_app(app):
+    app.before_request(_start)
+    app.after_request(_finish)
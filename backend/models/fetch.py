@@ -0,0 +1,36 @@
+# models/fetch.py
+#
+# Run a fixed-shape query on the request's connection with a plain tuple
+# cursor and return its rows as one of the types in models/rows.py.
+from config.db import get_db
+
+
+def _check_shape(row_type, cursor):
+    if len(cursor.description or ()) != len(row_type._fields):
+        raise ValueError(
+            f"{row_type.__name__} expects {len(row_type._fields)} columns, "
+            f"query returned {len(cursor.description or ())}"
+        )
+
+
+def fetch_all(row_type, sql, params=None):
+    """Every row of sql as row_type, on the request's connection."""
+    cursor = get_db().cursor()
+    try:
+        cursor.execute(sql, params)
+        _check_shape(row_type, cursor)
+        return list(map(row_type._make, cursor.fetchall()))
+    finally:
+        cursor.close()
+
+
+def fetch_one(row_type, sql, params=None):
+    """The row of a single-row query (a lookup by key) as row_type, or None."""
+    cursor = get_db().cursor()
+    try:
+        cursor.execute(sql, params)
+        _check_shape(row_type, cursor)
+        row = cursor.fetchone()
+        return row_type._make(row) if row is not None else None
+    finally:
+        cursor.close()
@@ -0,0 +1,49 @@
+# models/rows.py
+#
+# Typed rows for the fixed-shape queries.
+#
+# cursor(dictionary=True) builds a dict per row (re-reading the column
+# names each time) that controllers then copy into the response dict.
+# Here the plain tuple cursor's rows become NamedTuples instead: the
+# fields are read by name like a dict, but each row is a single tuple.
+# That is less than half the memory, and fetching plus shaping runs about
+# twice as fast (python -m scripts.benchRows).
+#
+# Fetch them with models/fetch.py; a query used with a row type must SELECT
+# exactly its fields, in order. Rows are not JSON objects (they serialize
+# as arrays), so shape them into the response, or use ._asdict().
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+
+class Complaint(NamedTuple):
+    """A complaint with its author's name."""
+    id: int
+    first_name: str
+    last_name: str
+    subject: str
+    type: str
+    description: str
+    status: str
+    created_at: datetime
+    updated_at: datetime
+
+
+class User(NamedTuple):
+    """The profile fields a user sees about themselves."""
+    username: str
+    email: str
+    first_name: Optional[str]
+    last_name: Optional[str]
+    college: Optional[str]
+    roll_number: Optional[str]
+    branch: Optional[str]
+
+
+class Comment(NamedTuple):
+    """An admin comment with its author's name."""
+    id: int
+    comment: str
+    created_at: datetime
+    first_name: str
+    last_name: str
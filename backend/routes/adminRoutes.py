@@ -5,54 +5,79 @@ from controllers.adminController import (
     getDashboardStats,
     getRecentComplaints,
     getComplaints,
+    exportComplaints,
     getComplaintById,
+    getComplaintsByIds,
+    batchComplaintTags,
     updateComplaintStatus,
     assignComplaint,
     addAdminComment,
     deleteComplaint,
     getAllUsers,
+    exportUsers,
     updateStaffStatus,
     deleteUser,
     getAuthorizedStaff,
     getStatistics,
     getLongestOpenComplaints,
     getRecentlyClosedComplaints,
-    getStaffAssignmentStats
+    getStaffAssignmentStats,
+    getPoolStats,
+    getCacheStats,
+    complaintVersion
 )
+from services.responseCache import cached, COMPLAINTS, USERS, complaint_tag
+from services.conditionalGet import conditional
+from services.idempotency import idempotent
 
 admin_bp = Blueprint("admin_bp", __name__)
 
 # --- Dashboard stats for cards ---
 @admin_bp.route("/dashboard-stats", methods=["GET"])
 @authenticate_token
+@cached(COMPLAINTS, USERS)
 def dashboard_stats():
     return getDashboardStats()
 
 # --- Recent complaints for table ---
 @admin_bp.route("/recent-complaints", methods=["GET"])
 @authenticate_token
+@cached(COMPLAINTS, USERS)
 def recent_complaints():
     return getRecentComplaints()
 
 # --- Complaints ---
 @admin_bp.route("/complaints", methods=["GET"])
 @authenticate_token
+@cached(COMPLAINTS, USERS, batchComplaintTags)
 def complaints():
+    # ?ids=1,2,3[&include=comments]: details for a page of rows
+    if request.args.get("ids"):
+        return getComplaintsByIds()
     return getComplaints()
 
+@admin_bp.route("/complaints/export", methods=["GET"])
+@authenticate_token
+def complaints_export():
+    return exportComplaints()
+
 @admin_bp.route("/complaints/<int:id>", methods=["GET"])
 @authenticate_token
+@cached(lambda id: complaint_tag(id), USERS)
+@conditional(complaintVersion)
 def complaint_by_id(id):
     return getComplaintById(id)
 
 @admin_bp.route("/complaints/<int:id>/status", methods=["PATCH"])
 @authenticate_token
+@idempotent
 def complaint_status(id):
     data = request.get_json()
     return updateComplaintStatus(id, data)
 
 @admin_bp.route("/complaints/<int:id>/assign", methods=["PATCH"])
 @authenticate_token
+@idempotent
 def complaint_assign(id):
     data = request.get_json()
     return assignComplaint(id, data)
@@ -71,9 +96,15 @@ def complaint_delete(id):
 # --- Users ---
 @admin_bp.route("/users", methods=["GET"])
 @authenticate_token
+@cached(USERS)
 def users():
     return getAllUsers()
 
+@admin_bp.route("/users/export", methods=["GET"])
+@authenticate_token
+def users_export():
+    return exportUsers()
+
 @admin_bp.route("/users/<int:id>/status", methods=["PATCH"])
 @authenticate_token
 def user_status(id):
@@ -94,20 +125,36 @@ def authorized_staff():
 # --- Statistics ---
 @admin_bp.route("/statistics", methods=["GET"])
 @authenticate_token
+@cached(COMPLAINTS, USERS)
 def statistics():
     return getStatistics()
 
 @admin_bp.route("/statistics/longest-open", methods=["GET"])
 @authenticate_token
+@cached(COMPLAINTS, USERS)
 def longest_open():
     return getLongestOpenComplaints()
 
 @admin_bp.route("/statistics/recently-closed", methods=["GET"])
 @authenticate_token
+@cached(COMPLAINTS, USERS)
 def recently_closed():
     return getRecentlyClosedComplaints()
 
 @admin_bp.route("/statistics/staff-assignment", methods=["GET"])
 @authenticate_token
+@cached(COMPLAINTS, USERS)
 def staff_assignment():
     return getStaffAssignmentStats()
+
+# --- Connection pool health ---
+@admin_bp.route("/pool-stats", methods=["GET"])
+@authenticate_token
+def pool_stats():
+    return getPoolStats()
+
+# --- Response cache hit ratio ---
+@admin_bp.route("/cache-stats", methods=["GET"])
+@authenticate_token
+def cache_stats():
+    return getCacheStats()
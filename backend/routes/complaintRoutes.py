@@ -4,9 +4,14 @@ from flask import Blueprint
 from controllers.complaintController import (
     addComplaint,
     getUserUnsolvedComplaints,
-    getUserSolvedComplaints
+    getUserSolvedComplaints,
+    userUnsolvedVersion,
+    userSolvedVersion,
+    getComplaintAttachment
 )
 from middleware.authMiddleware import authenticate_token
+from services.conditionalGet import conditional
+from services.idempotency import idempotent
 
 complaint_bp = Blueprint("complaint_bp", __name__)
 
@@ -15,6 +20,7 @@ complaint_bp = Blueprint("complaint_bp", __name__)
 # =========================================================
 @complaint_bp.route("", methods=["POST"])
 @authenticate_token
+@idempotent
 def create_complaint():
     # All form-data & files are handled in controller
     return addComplaint()
@@ -24,6 +30,7 @@ def create_complaint():
 # =========================================================
 @complaint_bp.route("/unsolved", methods=["GET"])
 @authenticate_token
+@conditional(userUnsolvedVersion)
 def unsolved_complaints():
     return getUserUnsolvedComplaints()
 
@@ -32,6 +39,14 @@ def unsolved_complaints():
 # =========================================================
 @complaint_bp.route("/solved", methods=["GET"])
 @authenticate_token
+@conditional(userSolvedVersion)
 def solved_complaints():
     return getUserSolvedComplaints()
 
+# =========================================================
+# Download a complaint's attachment (Range / ETag aware)
+# =========================================================
+@complaint_bp.route("/<int:id>/attachment", methods=["GET"])
+@authenticate_token
+def complaint_attachment(id):
+    return getComplaintAttachment(id)
@@ -4,9 +4,12 @@ from controllers.staffController import (
     getComplaintStats,
     allComplaints,
     updateComplaintStatus,
-    getAllSolvedComplaints
+    getAllSolvedComplaints,
+    allComplaintsVersion
 )
 from middleware.authMiddleware import authenticate_token
+from services.responseCache import cached, COMPLAINTS, USERS
+from services.conditionalGet import conditional
 
 staff_bp = Blueprint("staff_bp", __name__)
 
@@ -19,12 +22,15 @@ def profile():
 # --- Stats (numbers, for dashboard + chart) ---
 @staff_bp.route("/complaints/stats", methods=["GET"])
 @authenticate_token
+@cached(COMPLAINTS)
 def complaint_stats():
     return getComplaintStats()
 
 # --- List all complaints (with search/filter query params) ---
 @staff_bp.route("/complaints", methods=["GET"])
 @authenticate_token
+@cached(COMPLAINTS, USERS)
+@conditional(allComplaintsVersion)
 def complaints():
     return allComplaints()
 
@@ -38,5 +44,6 @@ def complaint_status(id):
 # --- All solved complaints for table ---
 @staff_bp.route("/complaints/solved", methods=["GET"])
 @authenticate_token
+@cached(COMPLAINTS, USERS)
 def solved_complaints():
     return getAllSolvedComplaints()
@@ -0,0 +1,130 @@
+# scripts/benchInserts.py
+#
+# Complaint inserts/s under concurrent submission: the regular addComplaint
+# path (one connection, INSERT + counters + commit per complaint) against
+# group commit (services/groupCommit.py), at the same concurrency.
+#
+# Needs a LOCAL database (DB_* env vars) with at least one user, e.g. from
+# scripts/seedData.py. The benchmark's complaints are deleted afterwards and
+# complaint_counters rebuilt. DB_POOL_SIZE must cover --concurrency for the
+# direct path to be fair.
+#
+# Run from backend/:
+#   python -m scripts.benchInserts --inserts 2000 --concurrency 32
+#   python -m scripts.benchInserts --max-batch 128 --max-delay-ms 2
+import argparse
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_SUBJECT = "benchInserts"
+
+
+def direct_insert(row):
+    """What addComplaint does without group commit."""
+    from config.db import get_connection
+    from services.complaintCounters import record_insert
+
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO complaints (user_id, subject, type, description, status)
+                VALUES (%s, %s, %s, %s, 'Unsolved')
+            """, row)
+            complaint_id = cursor.lastrowid
+        finally:
+            cursor.close()
+        record_insert(conn, complaint_id)
+        conn.commit()
+        return complaint_id
+    finally:
+        conn.close()
+
+
+def run(insert, user_id, inserts, concurrency):
+    """Seconds to insert `inserts` complaints from `concurrency` threads; also the ids."""
+    counter = iter(range(inserts))
+    lock = threading.Lock()
+    ids = []
+
+    def client():
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            complaint_id = insert((user_id, BENCH_SUBJECT, "Other", f"Benchmark complaint {i}"))
+            with lock:
+                ids.append(complaint_id)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        for future in [pool.submit(client) for _ in range(concurrency)]:
+            future.result()
+    return time.perf_counter() - start, ids
+
+
+def cleanup(conn):
+    from services.complaintCounters import rebuild
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute("DELETE FROM complaints WHERE subject = %s", (BENCH_SUBJECT,))
+        removed = cursor.rowcount
+        conn.commit()
+    finally:
+        cursor.close()
+    rebuild(conn)
+    return removed
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Benchmark direct complaint inserts against group commit.")
+    parser.add_argument("--inserts", type=int, default=2000, help="complaints per mode")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--max-batch", type=int, default=None, help="default GROUP_COMMIT_MAX_BATCH")
+    parser.add_argument("--max-delay-ms", type=float, default=None, help="default GROUP_COMMIT_MAX_DELAY_MS")
+    args = parser.parse_args(argv[1:])
+
+    from dotenv import load_dotenv
+    load_dotenv()
+    from config.db import get_connection
+    from controllers.complaintController import _insert_complaints
+    from services.groupCommit import GroupCommit, GROUP_COMMIT_MAX_BATCH, GROUP_COMMIT_MAX_DELAY_MS
+
+    max_batch = args.max_batch or GROUP_COMMIT_MAX_BATCH
+    max_delay_ms = GROUP_COMMIT_MAX_DELAY_MS if args.max_delay_ms is None else args.max_delay_ms
+    group = GroupCommit("bench", _insert_complaints, max_batch=max_batch, max_delay_ms=max_delay_ms)
+
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT id FROM users ORDER BY id LIMIT 1")
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+        if row is None:
+            print("No users to own the complaints; run python -m scripts.seedData first")
+            return 1
+
+        print(f"{args.inserts} inserts per mode, {args.concurrency} concurrent clients; "
+              f"group commit: max batch {max_batch}, max delay {max_delay_ms:g} ms")
+        try:
+            for name, insert in (("direct", direct_insert), ("group commit", group.submit)):
+                seconds, ids = run(insert, row[0], args.inserts, args.concurrency)
+                distinct = len(set(ids)) == len(ids) == args.inserts
+                print(f"  {name:14} {args.inserts / seconds:10,.0f} inserts/s   "
+                      f"{seconds:7.2f}s   distinct ids: {distinct}")
+        finally:
+            print(f"Removed {cleanup(conn)} benchmark complaints; counters rebuilt")
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,97 @@
+# scripts/benchJson.py
+#
+# Micro-benchmark for the complaint list response path: building the items
+# and serializing them. Compares
+#   before - Python per-row shaping + Flask's stdlib JSON provider
+#   after  - rows already shaped by SQL + services/jsonProvider.py
+# on synthetic rows shaped like getComplaints() results. No database needed.
+#
+# Run from backend/:
+#   python -m scripts.benchJson --rows 5000 --repeat 20
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from services.jsonProvider import FastJSONProvider, orjson
+
+
+def raw_rows(n, rng):
+    """Rows as the old getComplaints SELECT returned them."""
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    rows = []
+    for i in range(n):
+        created = now - timedelta(minutes=rng.randint(0, 500000))
+        assigned = rng.random() < 0.7
+        rows.append({
+            "id": n - i, "subject": "Projector not working", "type": "ClassRoom",
+            "status": rng.choice(["Solved", "Unsolved", "Pending"]),
+            "description": "Projector in room 204 flickers and turns off after ten minutes.",
+            "created_at": created, "updated_at": created + timedelta(hours=5),
+            "assigned_to": 7 if assigned else None,
+            "first_name": "Meera", "last_name": "Iyer", "user_role": "User",
+            "assigned_first": "Dev" if assigned else None, "assigned_last": "Rao" if assigned else None,
+        })
+    return rows
+
+
+def shape(rows):
+    """The per-row transform getComplaints() used to run in Python."""
+    return [{
+        "id": r["id"],
+        "user": f"{r['first_name']} {r['last_name']}",
+        "role": r["user_role"],
+        "type": r["type"],
+        "subject": r["subject"],
+        "status": r["status"],
+        "submitted": r["created_at"],
+        "updated": r["updated_at"],
+        "assignedTo": f"{r['assigned_first']} {r['assigned_last']}" if r['assigned_to'] else ""
+    } for r in rows]
+
+
+def best_of(repeat, fn):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Benchmark list shaping + JSON serialization.")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv[1:])
+
+    rows = raw_rows(args.rows, random.Random(1))
+    # What the new SQL returns: the shaped items themselves
+    shaped = shape(rows)
+
+    app = Flask(__name__)
+    stdlib = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+
+    with app.app_context():
+        same = stdlib.loads(stdlib.response(shaped).get_data()) == fast.loads(fast.response(shaped).get_data())
+        results = [
+            ("before: shape in Python + stdlib json", best_of(args.repeat, lambda: stdlib.response(shape(rows)))),
+            ("stdlib json only", best_of(args.repeat, lambda: stdlib.response(shaped))),
+            ("after: shaped by SQL + " + ("orjson" if orjson else "stdlib fallback"),
+             best_of(args.repeat, lambda: fast.response(shaped))),
+        ]
+
+    print(f"{args.rows} rows, best of {args.repeat} runs; identical output: {same}")
+    baseline = results[0][1]
+    for name, seconds in results:
+        print(f"  {name:44} {seconds * 1000:8.2f} ms  {args.rows / seconds:12,.0f} rows/s  x{baseline / seconds:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
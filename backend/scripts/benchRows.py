@@ -0,0 +1,129 @@
+# scripts/benchRows.py
+#
+# Micro-benchmark for fetched rows: dict rows (what cursor(dictionary=True)
+# builds) against the NamedTuple rows of models/rows.py, for the staff
+# "solved complaints" list. Measures the memory held by the fetched rows
+# per 10k rows, and rows/s for fetch + shaping into the response items.
+#
+# The cursor is simulated from its output: the C extension hands back plain
+# tuples, and its dict cursor turns each one into
+# dict(zip(cursor.column_names, row)), re-reading column_names every row.
+# No database needed.
+#
+# Run from backend/:
+#   python -m scripts.benchRows --rows 10000 --repeat 20
+import argparse
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from models.rows import Complaint
+
+
+class TupleCursor:
+    """The parts of CMySQLCursor the two fetch paths use."""
+
+    def __init__(self, rows):
+        self.description = [(name, 253, None, None, None, None, 1, 0, 0) for name in Complaint._fields]
+        self._rows = rows
+
+    @property
+    def column_names(self):
+        return tuple(d[0] for d in self.description)
+
+    def fetchall(self):
+        return list(self._rows)
+
+
+def fetch_dicts(cursor):
+    """CMySQLCursorDict.fetchall()."""
+    return [dict(zip(cursor.column_names, row)) for row in cursor.fetchall()]
+
+
+def fetch_rows(cursor):
+    """models.fetch.fetch_all()."""
+    return list(map(Complaint._make, cursor.fetchall()))
+
+
+def shape_dicts(rows):
+    return [{
+        "id": row["id"],
+        "user": f"{row['first_name']} {row['last_name']}",
+        "subject": row["subject"],
+        "type": row["type"],
+        "issuedDate": row["created_at"],
+        "solvedDate": row["updated_at"],
+        "description": row["description"],
+        "status": row["status"]
+    } for row in rows]
+
+
+def shape_rows(rows):
+    return [{
+        "id": row.id,
+        "user": f"{row.first_name} {row.last_name}",
+        "subject": row.subject,
+        "type": row.type,
+        "issuedDate": row.created_at,
+        "solvedDate": row.updated_at,
+        "description": row.description,
+        "status": row.status
+    } for row in rows]
+
+
+def raw_rows(n):
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    return [
+        (n - i, "Meera", "Iyer", "Projector not working", "ClassRoom",
+         "Projector in room 204 flickers and turns off after ten minutes.", "Solved",
+         now - timedelta(minutes=i), now - timedelta(minutes=i // 2))
+        for i in range(n)
+    ]
+
+
+def held_bytes(fetch, cursor):
+    """Bytes still allocated by the fetched rows (the cursor's tuples excluded)."""
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    rows = fetch(cursor)
+    held = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del rows
+    return held
+
+
+def best_of(repeat, fn):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Benchmark dict rows against models/rows.py rows.")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv[1:])
+
+    cursor = TupleCursor(raw_rows(args.rows))
+    same = shape_dicts(fetch_dicts(cursor)) == shape_rows(fetch_rows(cursor))
+
+    paths = [
+        ("dict cursor", fetch_dicts, shape_dicts),
+        ("tuple cursor + models.rows", fetch_rows, shape_rows),
+    ]
+    print(f"{args.rows} rows, best of {args.repeat} runs; identical items: {same}")
+    print(f"  {'':28} {'KiB/10k rows':>12} {'fetch rows/s':>14} {'fetch+shape rows/s':>19}")
+    for name, fetch, shape in paths:
+        per_10k = held_bytes(fetch, cursor) / 1024 * 10000 / args.rows
+        fetch_s = best_of(args.repeat, lambda: fetch(cursor))
+        total_s = best_of(args.repeat, lambda: shape(fetch(cursor)))
+        print(f"  {name:28} {per_10k:12,.0f} {args.rows / fetch_s:14,.0f} {args.rows / total_s:19,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,359 @@
+# scripts/checkQueryPlans.py
+#
+# Query-plan regression check for every SQL statement in the controllers
+# (and the services they call).
+#
+# Statements are pulled out of the source with the ast module - no app code
+# is imported - then EXPLAINed against the database in DB_* (point it at a
+# copy seeded by scripts/seedData.py, never production). Dynamic queries are rebuilt
+# with every optional filter switched on and the keyset ORDER BY / LIMIT
+# that Keyset.apply() adds; %s placeholders get sample values.
+#
+# Run from backend/:
+#   python -m scripts.checkQueryPlans            # compare with golden plans
+#   python -m scripts.checkQueryPlans --update   # rewrite golden plans
+#   python -m scripts.checkQueryPlans --record-missing  # record plans that have no golden file
+#   python -m scripts.checkQueryPlans --list     # print extracted SQL only
+#
+# Exit status is 1 when a hot-path statement full-scans or filesorts more than
+# PLAN_MAX_ROWS rows, or when any plan differs from its golden file in
+# scripts/queryPlans/ (commit the --update output so reviews show the change),
+# or has no golden file at all. Names are positional within a function
+# (getComplaints.1, .2, ...), so a query added to a function shows up as
+# missing plans for its neighbours rather than being recorded silently.
+# Locally, --record-missing writes the plans of new statements (say, on the
+# first run against a seeded database) without failing; commit those files.
+import ast
+import os
+import re
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GOLDEN_DIR = os.path.join(BACKEND_DIR, "scripts", "queryPlans")
+
+SOURCES = [
+    "controllers/adminController.py",
+    "controllers/staffController.py",
+    "controllers/complaintController.py",
+    "controllers/authController.py",
+    "controllers/userController.py",
+    "services/statsService.py",
+    "services/complaintCounters.py",
+    "services/referenceData.py",
+    "services/attachments.py",
+    "services/idempotency.py",
+]
+
+# Plans on these paths may not full-scan / filesort more than PLAN_MAX_ROWS rows
+PLAN_MAX_ROWS = int(os.environ.get("PLAN_MAX_ROWS", "1000"))
+HOT_PATHS = {
+    "adminController._dashboard_stats",
+    "adminController.getRecentComplaints",
+    "adminController.getComplaints",
+    "adminController.getComplaintById",
+    "adminController.getComplaintsByIds",
+    "adminController.getAllUsers",
+    "adminController.getLongestOpenComplaints",
+    "adminController.getRecentlyClosedComplaints",
+    "adminController.getStaffAssignmentStats",
+    "referenceData._load_authorized_staff",
+    "staffController.getProfile",
+    "staffController.allComplaints",
+    "staffController.getAllSolvedComplaints",
+    "complaintController.getUserUnsolvedComplaints",
+    "complaintController.getUserSolvedComplaints",
+    "authController.loginUser",
+    "userController.get_user_profile",
+    "statsService.COMPLAINT_SUMMARY_SQL",
+    "complaintCounters.SNAPSHOT_SQL",
+}
+# Known, accepted scans: statement name -> reason
+ALLOWED_SCANS = {
+    "statsService.COMPLAINT_SUMMARY_SQL": "reads the whole counters table by design (a few rows per type and day)",
+}
+
+SQL_START = re.compile(r"^\s*(SELECT|INSERT|UPDATE|DELETE|WITH)\b", re.IGNORECASE)
+PLAN_COLUMNS = ("id", "select_type", "table", "type", "possible_keys", "key", "ref", "Extra")
+
+# Sample values for "<column> <op> %s"; anything else gets '1'
+SAMPLE_VALUES = {
+    "status": "'Solved'",
+    "staff_status": "'Authorized'",
+    "type": "'General'",
+    "email": "'user1@example.com'",
+    "created_at": "'2025-01-01 00:00:00'",
+    "updated_at": "'2025-01-01 00:00:00'",
+    "day": "'2025-01-01'",
+}
+
+
+# ====================
+# EXTRACTION
+# ====================
+def _text(node, consts=None):
+    """Best-effort string value of an expression; interpolations become ''.
+
+    Inside a concatenation, names of module-level string constants resolve
+    to their value ("INSERT ..." + RECOUNT_SQL).
+    """
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.JoinedStr):
+        return "".join(v.value for v in node.values if isinstance(v, ast.Constant))
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+        def part(side):
+            if isinstance(side, ast.Name) and consts:
+                return consts.get(side.id)
+            return _text(side, consts)
+        left, right = part(node.left), part(node.right)
+        if left is None and right is None:
+            return None
+        return (left or "") + (right or "")
+    return None
+
+
+def _is_sql(text):
+    return bool(text and SQL_START.match(text))
+
+
+def _keysets(tree):
+    """Module-level NAME = Keyset(("expr", "key"), ..., descending=...) definitions."""
+    found = {}
+    for node in tree.body:
+        if not (isinstance(node, ast.Assign) and isinstance(node.value, ast.Call)):
+            continue
+        call = node.value
+        if getattr(call.func, "id", None) != "Keyset":
+            continue
+        columns = [ast.literal_eval(arg)[0] for arg in call.args]
+        descending = True
+        for kw in call.keywords:
+            if kw.arg == "descending":
+                descending = ast.literal_eval(kw.value)
+        direction = "DESC" if descending else "ASC"
+        order = ", ".join(f"{c} {direction}" for c in columns)
+        found[node.targets[0].id] = f" ORDER BY {order} LIMIT %s"
+    return found
+
+
+class _FunctionScanner(ast.NodeVisitor):
+    """Collects the SQL statements one function executes, in source order."""
+
+    def __init__(self, keysets, consts, builders):
+        self.keysets = dict(keysets)
+        self.consts = consts
+        self.builders = builders
+        self.current = None
+        self.returned = None
+        self.statements = []
+
+    def _emit(self, text):
+        if _is_sql(text):
+            self.statements.append(text)
+
+    def visit_Assign(self, node):
+        names = [t.id for t in node.targets if isinstance(t, ast.Name)]
+        # sql = _detail_query() / sql, params, found = _list_query() -> continue from the builder's SQL
+        unpacked = [e.id for t in node.targets if isinstance(t, ast.Tuple) for e in t.elts if isinstance(e, ast.Name)]
+        if "sql" in names + unpacked and isinstance(node.value, ast.Call) and getattr(node.value.func, "id", None) in self.builders:
+            self.current = self.builders[node.value.func.id]
+            return
+        if "sql" in names:
+            text = _text(node.value, self.consts)
+            if _is_sql(text):
+                self.current = text
+                return
+        # keyset = RANKED_KEYSET if found.ranked else KEYSET -> plan the unsearched one
+        if names and isinstance(node.value, ast.IfExp) and getattr(node.value.orelse, "id", None) in self.keysets:
+            self.keysets[names[0]] = self.keysets[node.value.orelse.id]
+            return
+        self.generic_visit(node)
+
+    def visit_AugAssign(self, node):
+        if isinstance(node.target, ast.Name) and node.target.id == "sql" and self.current is not None:
+            self.current += _text(node.value, self.consts) or ""
+            return
+        self.generic_visit(node)
+
+    def visit_Return(self, node):
+        # return sql, params, ... -> a query builder other functions call
+        value = node.value.elts[0] if isinstance(node.value, ast.Tuple) and node.value.elts else node.value
+        if isinstance(value, ast.Name) and value.id == "sql" and self.current is not None:
+            self.returned = self.current
+            return
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        func = node.func
+        # KEYSET.apply(sql_or_literal, params, page)
+        if isinstance(func, ast.Attribute) and func.attr == "apply" and getattr(func.value, "id", None) in self.keysets:
+            base = _text(node.args[0], self.consts) if node.args else None
+            if _is_sql(base):
+                self.current = base
+            if self.current is not None:
+                suffix = self.keysets[func.value.id]
+                if len(node.args) > 2 and isinstance(node.args[2], ast.Constant) and node.args[2].value is None:
+                    suffix = suffix.replace(" LIMIT %s", "")  # apply(sql, params, None): unpaged
+                self.current += suffix
+            return
+
+        for arg in node.args:
+            if isinstance(arg, ast.Name) and arg.id == "sql" and self.current is not None:
+                self.statements.append(self.current)
+            else:
+                self._emit(_text(arg, self.consts))
+        self.generic_visit(node)
+
+
+def extract(path):
+    """[(name, sql)] for one source file."""
+    with open(os.path.join(BACKEND_DIR, path), encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    module = os.path.splitext(os.path.basename(path))[0]
+    keysets = _keysets(tree)
+    consts = {}
+    builders = {}
+    found = []
+
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name):
+            text = _text(node.value)
+            if _is_sql(text):
+                consts[node.targets[0].id] = text
+                found.append((f"{module}.{node.targets[0].id}", text))
+        elif isinstance(node, ast.FunctionDef):
+            scanner = _FunctionScanner(keysets, consts, builders)
+            for stmt in node.body:
+                scanner.visit(stmt)
+            if scanner.returned is not None:
+                # Planned where it is called, with the caller's ORDER BY / LIMIT
+                builders[node.name] = scanner.returned
+            unique = list(dict.fromkeys(scanner.statements))
+            for i, text in enumerate(unique):
+                suffix = f".{i + 1}" if len(unique) > 1 else ""
+                found.append((f"{module}.{node.name}{suffix}", text))
+    return found
+
+
+def concrete(sql):
+    """Replace %s placeholders with sample literals EXPLAIN can plan with."""
+    def sample(match):
+        before = sql[:match.start()]
+        if re.search(r"LIMIT\s*$", before, re.IGNORECASE):
+            return "51"
+        if re.search(r"LIKE\s*$", before, re.IGNORECASE):
+            return "'%a%'"
+        if re.search(r"AGAINST\s*\(\s*$", before, re.IGNORECASE):
+            return "'+a*'"
+        column = re.search(r"(\w+)\s*(=|<>|!=|<=|>=|<|>)\s*$", before)
+        if column:
+            return SAMPLE_VALUES.get(column.group(1), "'1'")
+        return "'1'"
+    return re.sub(r"%s", sample, sql)
+
+
+def all_statements():
+    statements = []
+    for path in SOURCES:
+        statements.extend(extract(path))
+    return statements
+
+
+# ====================
+# PLANS
+# ====================
+def explain(cursor, sql):
+    cursor.execute("EXPLAIN " + concrete(sql))
+    return cursor.fetchall()
+
+
+def render(rows):
+    lines = [" | ".join(PLAN_COLUMNS)]
+    for row in rows:
+        lines.append(" | ".join("" if row.get(c) is None else str(row.get(c)) for c in PLAN_COLUMNS))
+    return "\n".join(lines) + "\n"
+
+
+def problems(name, rows):
+    base = name.split(".")
+    base = ".".join(base[:2])
+    if base not in HOT_PATHS or name in ALLOWED_SCANS or base in ALLOWED_SCANS:
+        return []
+    found = []
+    for row in rows:
+        scanned = int(row.get("rows") or 0)
+        extra = row.get("Extra") or ""
+        if row.get("type") == "ALL" and scanned > PLAN_MAX_ROWS:
+            found.append(f"full scan of {row.get('table')} (~{scanned} rows)")
+        if "Using filesort" in extra and scanned > PLAN_MAX_ROWS:
+            found.append(f"filesort on {row.get('table')} (~{scanned} rows)")
+    return found
+
+
+def golden_path(name):
+    return os.path.join(GOLDEN_DIR, name + ".plan")
+
+
+def main(argv):
+    statements = all_statements()
+
+    if "--list" in argv:
+        for name, sql in statements:
+            print(f"-- {name}\n{concrete(sql).strip()};\n")
+        return 0
+
+    from dotenv import load_dotenv
+    load_dotenv()
+    from config.db import get_connection
+
+    update = "--update" in argv
+    record_missing = "--record-missing" in argv
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    failures = 0
+    recorded = 0
+
+    conn = get_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        for name, sql in statements:
+            try:
+                rows = explain(cursor, sql)
+            except Exception as err:
+                print(f"ERROR    {name}: {err}")
+                failures += 1
+                continue
+
+            plan = render(rows)
+            path = golden_path(name)
+            if update:
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(plan)
+            elif not os.path.exists(path):
+                if record_missing:
+                    with open(path, "w", encoding="utf-8") as f:
+                        f.write(plan)
+                    print(f"NEW      {name}: recorded {os.path.relpath(path, BACKEND_DIR)} (commit it)")
+                    recorded += 1
+                else:
+                    print(f"MISSING  {name}: no golden plan (run with --record-missing or --update)\n{plan}")
+                    failures += 1
+            else:
+                with open(path, encoding="utf-8") as f:
+                    expected = f.read()
+                if expected != plan:
+                    print(f"CHANGED  {name}\n--- golden\n{expected}+++ current\n{plan}")
+                    failures += 1
+
+            for problem in problems(name, rows):
+                print(f"SLOW     {name}: {problem}")
+                failures += 1
+    finally:
+        cursor.close()
+        conn.close()
+
+    print(f"{len(statements)} statement(s) checked, {failures} problem(s), {recorded} new golden plan(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,227 @@
+# scripts/loadTest.py
+#
+# Load driver for the Flask API. Replays a realistic traffic mix against a
+# running server using the accounts written by scripts/seedData.py, then
+# prints throughput and p50/p95/p99 latency per route.
+#
+# Run from backend/ (stdlib only, no extra packages):
+#   python -m scripts.loadTest --url http://localhost:5000 --duration 60 --concurrency 16
+#   python -m scripts.loadTest --mix user=40,staff=30,admin=20,submit=10
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from scripts.seedData import COMPLAINT_TYPES, SEED_DOMAIN, SUBJECT_WORDS
+
+DEFAULT_MIX = "user=40,staff=30,admin=20,submit=10"
+
+
+class Recorder:
+    """Latencies per route template, plus error counts (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+
+    def add(self, route, seconds, ok):
+        with self._lock:
+            self.latencies.setdefault(route, []).append(seconds)
+            if not ok:
+                self.errors[route] = self.errors.get(route, 0) + 1
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class Client:
+    def __init__(self, base_url, recorder):
+        self.base_url = base_url.rstrip("/")
+        self.recorder = recorder
+
+    def request(self, method, path, route=None, token=None, body=None, content_type=None):
+        headers = {}
+        if token:
+            headers["Authorization"] = "Bearer " + token
+        if content_type:
+            headers["Content-Type"] = content_type
+        req = urllib.request.Request(self.base_url + path, data=body, method=method, headers=headers)
+
+        start = time.perf_counter()
+        status, payload = 0, b""
+        try:
+            with urllib.request.urlopen(req, timeout=30) as resp:
+                status, payload = resp.status, resp.read()
+        except urllib.error.HTTPError as err:
+            status, payload = err.code, err.read()
+        except Exception:
+            status = 0
+        elapsed = time.perf_counter() - start
+
+        if route:
+            self.recorder.add(route, elapsed, 200 <= status < 400)
+        return status, payload
+
+    def login(self, email, password):
+        body = json.dumps({"email": email, "password": password}).encode("utf-8")
+        status, payload = self.request("POST", "/api/auth/login", body=body, content_type="application/json")
+        if status != 200:
+            return None
+        return json.loads(payload)["access_token"]
+
+
+def multipart(fields, file_field=None, filename=None, file_bytes=b"", file_type="application/octet-stream"):
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode("utf-8"))
+    if file_field:
+        parts.append((f'--{boundary}\r\nContent-Disposition: form-data; name="{file_field}"; filename="{filename}"\r\n'
+                      f"Content-Type: {file_type}\r\n\r\n").encode("utf-8") + file_bytes + b"\r\n")
+    parts.append(f"--{boundary}--\r\n".encode("utf-8"))
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+# ====================
+# SCENARIOS (one "page view" each, like the HTML pages do)
+# ====================
+def user_dashboard(client, tokens, rng):
+    token = rng.choice(tokens["user"])
+    client.request("GET", "/api/user/me", "GET /api/user/me", token)
+    client.request("GET", "/api/complaints/unsolved", "GET /api/complaints/unsolved", token)
+    client.request("GET", "/api/complaints/solved", "GET /api/complaints/solved", token)
+
+
+def staff_lists(client, tokens, rng):
+    token = rng.choice(tokens["staff"])
+    client.request("GET", "/api/staff/profile", "GET /api/staff/profile", token)
+    client.request("GET", "/api/staff/complaints/stats", "GET /api/staff/complaints/stats", token)
+    roll = rng.random()
+    if roll < 0.4:
+        type_ = rng.choice(COMPLAINT_TYPES)[0]
+        client.request("GET", f"/api/staff/complaints?type={type_}", "GET /api/staff/complaints?type", token)
+    elif roll < 0.7:
+        word = rng.choice(rng.choice(list(SUBJECT_WORDS.values()))).split()[0]
+        client.request("GET", f"/api/staff/complaints?search={word}", "GET /api/staff/complaints?search", token)
+    else:
+        client.request("GET", "/api/staff/complaints/solved", "GET /api/staff/complaints/solved", token)
+
+
+def admin_statistics(client, tokens, rng):
+    token = rng.choice(tokens["admin"])
+    if rng.random() < 0.5:
+        client.request("GET", "/api/admin/dashboard-stats", "GET /api/admin/dashboard-stats", token)
+        client.request("GET", "/api/admin/recent-complaints", "GET /api/admin/recent-complaints", token)
+    else:
+        for path in ("/api/admin/statistics", "/api/admin/statistics/longest-open",
+                     "/api/admin/statistics/recently-closed", "/api/admin/statistics/staff-assignment"):
+            client.request("GET", path, "GET " + path, token)
+
+
+def submit_complaint(client, tokens, rng):
+    token = rng.choice(tokens["user"])
+    type_ = rng.choice(COMPLAINT_TYPES)[0]
+    subject = rng.choice(SUBJECT_WORDS[type_])
+    fields = {"subject": subject, "type": type_, "description": f"{subject} (load test)"}
+    if rng.random() < 0.5:
+        size = rng.randint(10 * 1024, 500 * 1024)
+        body, content_type = multipart(fields, "attachment", f"photo_{rng.randint(1, 10**6)}.jpg",
+                                       os.urandom(size), "image/jpeg")
+    else:
+        body, content_type = multipart(fields)
+    client.request("POST", "/api/complaints", "POST /api/complaints", token, body, content_type)
+
+
+SCENARIOS = {
+    "user": user_dashboard,
+    "staff": staff_lists,
+    "admin": admin_statistics,
+    "submit": submit_complaint,
+}
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise ValueError(f"unknown scenario '{name}' (choose from {', '.join(SCENARIOS)})")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def login_pool(client, password, per_role):
+    tokens = {}
+    for role in ("user", "staff", "admin"):
+        found = []
+        for i in range(1, per_role * 4 + 1):
+            token = client.login(f"{role}{i}@{SEED_DOMAIN}", password)
+            if token:
+                found.append(token)
+            if len(found) >= per_role:
+                break
+        if not found:
+            raise RuntimeError(f"Could not log in any seeded {role} account (run scripts.seedData first)")
+        tokens[role] = found
+    return tokens
+
+
+def report(recorder, wall_seconds):
+    total = sum(len(v) for v in recorder.latencies.values())
+    print(f"\n{total} requests in {wall_seconds:.1f}s = {total / wall_seconds:.1f} req/s\n")
+    header = f"{'route':48} {'count':>7} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}"
+    print(header)
+    print("-" * len(header))
+    for route in sorted(recorder.latencies):
+        values = sorted(recorder.latencies[route])
+        print(f"{route:48} {len(values):>7} {len(values) / wall_seconds:>7.1f} "
+              f"{percentile(values, 50) * 1000:>8.1f} {percentile(values, 95) * 1000:>8.1f} "
+              f"{percentile(values, 99) * 1000:>8.1f} {recorder.errors.get(route, 0):>7}")
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Replay a realistic traffic mix against the API.")
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to run")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"scenario weights (default {DEFAULT_MIX})")
+    parser.add_argument("--password", default="password123", help="password used by scripts.seedData")
+    parser.add_argument("--accounts", type=int, default=20, help="accounts logged in per role")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv[1:])
+
+    mix = parse_mix(args.mix)
+    recorder = Recorder()
+    client = Client(args.url, recorder)
+    tokens = login_pool(client, args.password, args.accounts)
+    names, weights = list(mix), list(mix.values())
+
+    deadline = time.monotonic() + args.duration
+
+    def worker(n):
+        rng = random.Random(args.seed + n)
+        while time.monotonic() < deadline:
+            SCENARIOS[rng.choices(names, weights=weights)[0]](client, tokens, rng)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(worker, range(args.concurrency)))
+    report(recorder, time.perf_counter() - start)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,227 @@
+# scripts/seedData.py
+#
+# Synthetic data for local load / plan testing. Writes users across roles,
+# complaints with realistic status/type/date mixes, staff assignments and
+# admin comments into the schema from config/complaint_db_schema.sql, then
+# rebuilds complaint_counters.
+#
+# Run from backend/ against a LOCAL database (DB_* env vars):
+#   python -m scripts.seedData --users 2000 --complaints 50000
+#   python -m scripts.seedData --reset          # remove previously seeded rows
+#
+# Every seeded account uses the domain below and the --password given
+# (default "password123"), e.g. user1@seed.example.com / staff1@... / admin1@...
+import argparse
+import random
+import sys
+from datetime import datetime, timedelta
+
+SEED_DOMAIN = "seed.example.com"
+ROLE_NAMES = ("admin", "staff", "user")
+
+FIRST_NAMES = ["Aarav", "Diya", "Ishaan", "Meera", "Rohan", "Ananya", "Kabir", "Sara", "Vivaan", "Tara",
+               "Arjun", "Nisha", "Dev", "Priya", "Karan", "Riya", "Sameer", "Zoya", "Aditya", "Leela"]
+LAST_NAMES = ["Sharma", "Patel", "Iyer", "Khan", "Reddy", "Gupta", "Nair", "Singh", "Das", "Mehta",
+              "Joshi", "Rao", "Bose", "Kapoor", "Verma"]
+BRANCHES = ["CSE", "ECE", "ME", "CE", "EEE", "IT"]
+
+# Same choices as addcomplaint.html, weighted by how often they come up
+COMPLAINT_TYPES = [("ClassRoom", 30), ("College", 25), ("Management", 15), ("Teacher", 20), ("Other", 10)]
+SUBJECT_WORDS = {
+    "ClassRoom": ["Projector not working", "Broken benches", "Fan noise", "No chalk", "Leaking roof", "Dirty floor"],
+    "College": ["Wifi down in library", "Canteen hygiene", "Water cooler empty", "Hostel power cut", "Bus delay"],
+    "Management": ["Fee receipt missing", "ID card delay", "Scholarship status", "Exam form error"],
+    "Teacher": ["Class cancelled again", "Marks not uploaded", "Lab session skipped", "Syllabus behind"],
+    "Other": ["Lost and found", "Parking issue", "Noise near hostel", "Event clash"],
+}
+
+
+def weighted(rng, pairs):
+    return rng.choices([v for v, _ in pairs], weights=[w for _, w in pairs])[0]
+
+
+def ensure_roles(cursor):
+    cursor.executemany("INSERT IGNORE INTO roles (name) VALUES (%s)", [(r,) for r in ROLE_NAMES])
+    cursor.execute("SELECT id, name FROM roles")
+    return {name.lower(): role_id for role_id, name in cursor.fetchall()}
+
+
+def reset(conn):
+    cursor = conn.cursor()
+    try:
+        pattern = f"%@{SEED_DOMAIN}"
+        cursor.execute("""
+            DELETE c FROM complaints c JOIN users u ON c.user_id = u.id
+            WHERE u.email LIKE %s
+        """, (pattern,))
+        complaints = cursor.rowcount
+        cursor.execute("DELETE FROM users WHERE email LIKE %s", (pattern,))
+        users = cursor.rowcount
+        conn.commit()
+        return users, complaints
+    finally:
+        cursor.close()
+
+
+def make_users(rng, count, roles, password_hash, now):
+    """Roughly 1% admins, 6% staff (mostly authorized), the rest students."""
+    admins = max(1, count // 100)
+    staff = max(1, count * 6 // 100)
+    rows = []
+    for role, n in (("admin", admins), ("staff", staff), ("user", count - admins - staff)):
+        for i in range(1, n + 1):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            staff_status = "Authorized" if role != "staff" else weighted(
+                rng, [("Authorized", 80), ("Pending", 15), ("Rejected", 5)])
+            rows.append((
+                f"{first} {last}", first, last, "Seed College",
+                f"R{i:06d}" if role == "user" else None,
+                rng.choice(BRANCHES) if role == "user" else None,
+                f"{role}{i}@{SEED_DOMAIN}", password_hash, roles[role],
+                now - timedelta(days=rng.randint(30, 900)),
+                role != "staff" or staff_status == "Authorized", staff_status
+            ))
+    return rows
+
+
+def complaint_row(rng, user_id, staff_ids, days, now):
+    """One complaint; older complaints are more likely to be resolved."""
+    age_days = min(days, int(rng.expovariate(1 / (days / 4))))
+    created = now - timedelta(days=age_days, seconds=rng.randint(0, 86399))
+    type_ = weighted(rng, COMPLAINT_TYPES)
+    solved_chance = min(0.9, 0.15 + age_days / days)
+    status = weighted(rng, [
+        ("Solved", solved_chance * 100),
+        ("Unsolved", (1 - solved_chance) * 55),
+        ("Pending", (1 - solved_chance) * 30),
+        ("In Progress", (1 - solved_chance) * 10),
+        ("Rejected", (1 - solved_chance) * 5),
+    ])
+    if status == "Unsolved":
+        updated = created
+    else:
+        updated = min(now, created + timedelta(hours=rng.randint(1, 24 * 21)))
+    assigned = rng.choice(staff_ids) if staff_ids and status != "Unsolved" and rng.random() < 0.8 else None
+    subject = rng.choice(SUBJECT_WORDS[type_])
+    return (
+        user_id, subject, type_,
+        f"{subject}. Reported near block {rng.randint(1, 12)}, room {rng.randint(100, 450)}.",
+        f"evidence_{rng.randint(1, 10**6)}.jpg" if rng.random() < 0.1 else None,
+        status, created, updated, assigned
+    )
+
+
+def seed(conn, users, complaints, days, password, batch, rng):
+    import bcrypt
+    from services.complaintCounters import rebuild
+
+    now = datetime.now().replace(microsecond=0)
+    # One cheap hash shared by every seeded account keeps seeding fast
+    password_hash = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=4)).decode("utf-8")
+
+    cursor = conn.cursor()
+    try:
+        roles = ensure_roles(cursor)
+        user_rows = make_users(rng, users, roles, password_hash, now)
+        for i in range(0, len(user_rows), batch):
+            cursor.executemany("""
+                INSERT IGNORE INTO users
+                    (name, first_name, last_name, college, roll_number, branch, email, password,
+                     role_id, created_at, is_approved, staff_status)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """, user_rows[i:i + batch])
+        conn.commit()
+
+        cursor.execute("""
+            SELECT u.id, r.name FROM users u JOIN roles r ON u.role_id = r.id
+            WHERE u.email LIKE %s
+        """, (f"%@{SEED_DOMAIN}",))
+        by_role = {name: [] for name in ROLE_NAMES}
+        for user_id, role in cursor.fetchall():
+            by_role.setdefault(role.lower(), []).append(user_id)
+        cursor.execute("""
+            SELECT u.id FROM users u JOIN roles r ON u.role_id = r.id
+            WHERE r.id = %s AND u.staff_status = 'Authorized' AND u.email LIKE %s
+        """, (roles["staff"], f"%@{SEED_DOMAIN}"))
+        staff_ids = [row[0] for row in cursor.fetchall()]
+        admin_ids = by_role["admin"]
+        student_ids = by_role["user"]
+
+        if not student_ids:
+            raise RuntimeError("No seeded student accounts to own complaints; raise --users")
+
+        # A few heavy reporters, a long tail of occasional ones
+        weights = [rng.paretovariate(1.2) for _ in student_ids]
+        inserted = 0
+        while inserted < complaints:
+            n = min(batch, complaints - inserted)
+            owners = rng.choices(student_ids, weights=weights, k=n)
+            cursor.executemany("""
+                INSERT INTO complaints
+                    (user_id, subject, type, description, attachment, status, created_at, updated_at, assigned_to)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """, [complaint_row(rng, owner, staff_ids, days, now) for owner in owners])
+            # Multi-row INSERT: ids are consecutive from the first one
+            first_id = cursor.lastrowid
+            conn.commit()
+
+            # ~30% of complaints get one to three admin comments
+            comments = []
+            for complaint_id in range(first_id, first_id + n):
+                if admin_ids and rng.random() < 0.3:
+                    for _ in range(rng.randint(1, 3)):
+                        comments.append((complaint_id, rng.choice(admin_ids),
+                                         rng.choice(["Looking into it.", "Forwarded to the department.",
+                                                     "Please share more details.", "Resolved on site."]),
+                                         now - timedelta(days=rng.randint(0, days))))
+            if comments:
+                cursor.executemany("""
+                    INSERT INTO admin_comments (complaint_id, admin_id, comment, created_at)
+                    VALUES (%s, %s, %s, %s)
+                """, comments)
+                conn.commit()
+
+            inserted += n
+            print(f"  {inserted}/{complaints} complaints", end="\r")
+        print()
+    finally:
+        cursor.close()
+
+    buckets = rebuild(conn)
+    return {role: len(ids) for role, ids in by_role.items()}, buckets
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Seed the local database with synthetic data.")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--complaints", type=int, default=20000)
+    parser.add_argument("--days", type=int, default=365, help="spread complaints over this many days")
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42, help="random seed (same seed, same data)")
+    parser.add_argument("--reset", action="store_true", help="only delete previously seeded rows")
+    args = parser.parse_args(argv[1:])
+
+    from dotenv import load_dotenv
+    load_dotenv()
+    from config.db import get_connection
+
+    conn = get_connection()
+    try:
+        if args.reset:
+            users, complaints = reset(conn)
+            from services.complaintCounters import rebuild
+            rebuild(conn)
+            print(f"Removed {users} seeded users and {complaints} complaints")
+            return 0
+
+        counts, buckets = seed(conn, args.users, args.complaints, args.days, args.password,
+                               args.batch, random.Random(args.seed))
+        print(f"Seeded users {counts}, {args.complaints} complaints; {buckets} counter buckets")
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,287 @@
+# services/attachments.py
+#
+# Content-addressed attachment store.
+#
+# Complaint uploads are parsed straight off the request stream instead of
+# through request.files: the file part is written to a temp file in
+# ATTACHMENT_DIR chunk by chunk while it is hashed, then renamed to
+# <ATTACHMENT_DIR>/<sha[:2]>/<sha[2:4]>/<sha256>. The same file uploaded
+# twice is stored once, and names chosen by clients never reach the disk.
+#
+# Size limits are enforced while reading: a Content-Length already over the
+# limit is refused before the body is read, and a chunked or lying upload
+# is cut off as soon as it passes ATTACHMENT_MAX_BYTES. Each file gets one
+# row in the attachments table (hash, size, MIME type), referenced by
+# complaints.attachment_id (config/migrations/0004_attachments.sql).
+#
+# A complaint whose insert fails after its file was placed enqueues
+# "attachment.discard", which removes the file unless an attachments row
+# (an earlier upload of the same content) still holds it.
+#
+# Deleting a complaint enqueues an "attachment.release" job
+# (services/jobQueue.py) that removes the row and the file once nothing
+# references them. Both sides lock the attachments row: an upload upserts it
+# before placing its file, and the release unlinks the file while holding
+# it, so a re-upload of the same content never loses its file.
+import hashlib
+import os
+import re
+import sys
+import tempfile
+import mimetypes
+from flask import request
+from werkzeug.datastructures import MultiDict
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.sansio.multipart import MultipartDecoder, Field, File, Data, Epilogue, NeedData
+from werkzeug.utils import secure_filename
+
+from config.db import get_db
+from services.jobQueue import handler, enqueue
+
+ATTACHMENT_DIR = os.environ.get("ATTACHMENT_DIR", "uploads")
+ATTACHMENT_MAX_BYTES = int(os.environ.get("ATTACHMENT_MAX_BYTES", str(10 * 1024 * 1024)))
+# Text fields of the same form (subject, description, ...) are kept in memory
+FORM_FIELD_MAX_BYTES = 64 * 1024
+READ_CHUNK_BYTES = 64 * 1024
+
+# Types a browser may render in place; anything else (HTML, SVG, ...) is
+# sent as a download so it cannot run script on this origin
+INLINE_TYPES = {"image/png", "image/jpeg", "image/gif", "image/webp", "application/pdf", "text/plain"}
+
+_MIME_RE = re.compile(r"^[a-z0-9][a-z0-9!#$&^_.+-]*/[a-z0-9][a-z0-9!#$&^_.+-]*$")
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+class InvalidUpload(ValueError):
+    pass
+
+
+class StoredFile:
+    """An uploaded file: its hash, size, MIME type and the client's filename.
+
+    The content waits in a temp file until place() moves it into the store
+    (after save_attachment() has locked its row); discard() drops it.
+    """
+
+    def __init__(self, sha256, size, mime_type, filename, writer=None):
+        self.sha256 = sha256
+        self.size = size
+        self.mime_type = mime_type
+        self.filename = filename
+        self.placed = False
+        self._writer = writer
+
+    def place(self):
+        if self._writer is not None:
+            self._writer.commit()
+            self._writer = None
+            self.placed = True
+
+    def discard(self):
+        if self._writer is not None:
+            self._writer.discard()
+            self._writer = None
+
+
+def path_for(sha256):
+    return os.path.join(ATTACHMENT_DIR, sha256[:2], sha256[2:4], sha256)
+
+
+def _mime_type(declared, filename):
+    declared = (declared or "").split(";")[0].strip().lower()
+    if _MIME_RE.match(declared) and declared != "application/octet-stream":
+        return declared
+    guessed = mimetypes.guess_type(filename)[0]
+    return guessed or "application/octet-stream"
+
+
+def inline_type(mime_type):
+    return mime_type in INLINE_TYPES or mime_type.startswith(("video/", "audio/"))
+
+
+class _FileWriter:
+    """Temp file in the store that hashes what is written and commits under its hash."""
+
+    def __init__(self):
+        os.makedirs(ATTACHMENT_DIR, exist_ok=True)
+        fd, self.temp_path = tempfile.mkstemp(prefix=".upload-", dir=ATTACHMENT_DIR)
+        self.file = os.fdopen(fd, "wb")
+        self.hash = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
+        if self.size > ATTACHMENT_MAX_BYTES:
+            raise UploadTooLarge(f"Attachment is larger than {ATTACHMENT_MAX_BYTES} bytes")
+        self.hash.update(data)
+        self.file.write(data)
+
+    def close(self):
+        self.file.close()
+        return self.hash.hexdigest()
+
+    def commit(self):
+        sha256 = self.close()
+        final = path_for(sha256)
+        if os.path.exists(final):
+            # Already stored: keep the existing copy
+            os.remove(self.temp_path)
+        else:
+            os.makedirs(os.path.dirname(final), exist_ok=True)
+            os.replace(self.temp_path, final)
+        return sha256
+
+    def discard(self):
+        self.file.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+
+def _chunks(stream):
+    while True:
+        data = stream.read(READ_CHUNK_BYTES)
+        if not data:
+            break
+        yield data
+    yield None
+
+
+def read_upload(file_field):
+    """Parse the multipart request body, storing file_field as it streams.
+
+    Returns (form fields, StoredFile or None); the caller must place() or
+    discard() the file. Other file parts are ignored. Raises UploadTooLarge
+    / InvalidUpload.
+    """
+    boundary = request.mimetype_params.get("boundary", "").encode("latin-1")
+    if request.mimetype != "multipart/form-data" or not boundary:
+        raise InvalidUpload("Expected a multipart/form-data body")
+    if request.content_length is not None and request.content_length > ATTACHMENT_MAX_BYTES + FORM_FIELD_MAX_BYTES:
+        raise UploadTooLarge(f"Attachment is larger than {ATTACHMENT_MAX_BYTES} bytes")
+
+    decoder = MultipartDecoder(boundary, max_form_memory_size=FORM_FIELD_MAX_BYTES)
+    fields = MultiDict()
+    stored = None
+    part, buffer, buffered, writer = None, None, 0, None
+    try:
+        for chunk in _chunks(request.stream):
+            decoder.receive_data(chunk)
+            event = decoder.next_event()
+            while not isinstance(event, (Epilogue, NeedData)):
+                if isinstance(event, Field):
+                    part, buffer, buffered = event, [], 0
+                elif isinstance(event, File):
+                    part, buffer = event, None
+                    if event.name == file_field and event.filename and stored is None:
+                        writer = _FileWriter()
+                elif isinstance(event, Data):
+                    if buffer is not None:
+                        buffered += len(event.data)
+                        if buffered > FORM_FIELD_MAX_BYTES:
+                            raise UploadTooLarge(f"Form field {part.name} is too large")
+                        buffer.append(event.data)
+                    elif writer is not None:
+                        writer.write(event.data)
+
+                    if not event.more_data:
+                        if buffer is not None:
+                            fields.add(part.name, b"".join(buffer).decode("utf-8", "replace"))
+                        elif writer is not None:
+                            if writer.size:
+                                stored = StoredFile(writer.close(), writer.size,
+                                                    _mime_type(part.headers.get("Content-Type"), part.filename),
+                                                    secure_filename(part.filename) or "attachment", writer)
+                            else:
+                                writer.discard()  # empty file input
+                            writer = None
+                        part, buffer = None, None
+                event = decoder.next_event()
+    except RequestEntityTooLarge:
+        raise UploadTooLarge("Form field is too large")
+    except UploadTooLarge:
+        raise
+    except ValueError as err:
+        raise InvalidUpload(f"Malformed multipart body: {err}")
+    finally:
+        if writer is not None:
+            writer.discard()
+        if stored is not None and sys.exc_info()[0] is not None:
+            stored.discard()
+    return fields, stored
+
+
+# ====================
+# DATABASE
+# ====================
+def save_attachment(cursor, stored):
+    """attachments row id for stored, inserting it the first time this content is seen.
+
+    The row stays locked until the caller's transaction ends; place() the
+    file inside that transaction.
+    """
+    # LAST_INSERT_ID(id) makes lastrowid the existing row's id on a duplicate
+    cursor.execute("""
+        INSERT INTO attachments (sha256, size, mime_type)
+        VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)
+    """, (stored.sha256, stored.size, stored.mime_type))
+    return cursor.lastrowid
+
+
+@handler("attachment.release")
+def release_attachment(payload):
+    """Delete an attachment's row and file once no complaint references it."""
+    conn = get_db()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "SELECT sha256 FROM attachments WHERE id = %s FOR UPDATE",
+            (payload["attachment_id"],)
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return  # already released
+        # Locking read: sees complaints committed while we waited for the row
+        cursor.execute(
+            "SELECT id FROM complaints WHERE attachment_id = %s LIMIT 1 FOR SHARE",
+            (payload["attachment_id"],)
+        )
+        if cursor.fetchone() is not None:
+            return
+        try:
+            os.remove(path_for(row[0]))
+        except FileNotFoundError:
+            pass
+        cursor.execute("DELETE FROM attachments WHERE id = %s", (payload["attachment_id"],))
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def abandon_placed(stored):
+    """After a rolled-back insert: drop stored's file later if nothing references it."""
+    enqueue("attachment.discard", {"sha256": stored.sha256})
+
+
+@handler("attachment.discard")
+def discard_unreferenced(payload):
+    """Delete a placed file that no attachments row references."""
+    conn = get_db()
+    cursor = conn.cursor()
+    try:
+        # Locks the row, or the gap where an upload of this content would insert it
+        cursor.execute(
+            "SELECT id FROM attachments WHERE sha256 = %s FOR UPDATE",
+            (payload["sha256"],)
+        )
+        if cursor.fetchone() is None:
+            try:
+                os.remove(path_for(payload["sha256"]))
+            except FileNotFoundError:
+                pass
+        conn.commit()
+    finally:
+        cursor.close()
@@ -0,0 +1,232 @@
+# services/complaintCounters.py
+#
+# complaint_counters keeps per (status, type, created day) totals so the
+# dashboards never have to scan complaints. Every write that can move a
+# complaint between buckets goes through this module on the caller's
+# connection, so the counter change commits (or rolls back) with it.
+#
+# Rebuild / verify from the command line (run from backend/):
+#   python -m services.complaintCounters verify
+#   python -m services.complaintCounters rebuild
+import json
+import sys
+
+# What a single complaint contributes to its counter row
+SNAPSHOT_SQL = """
+    SELECT status, type, DATE(created_at) AS day,
+           assigned_to IS NULL AS unassigned,
+           CASE WHEN status = 'Solved' THEN DATEDIFF(updated_at, created_at) END AS resolution_days
+    FROM complaints
+    WHERE id = %s
+"""
+
+UPSERT_SQL = """
+    INSERT INTO complaint_counters
+        (status, type, day, total, unassigned, resolution_days, resolution_samples)
+    VALUES (%s, %s, %s, %s, %s, %s, %s) AS d
+    ON DUPLICATE KEY UPDATE
+        total = complaint_counters.total + d.total,
+        unassigned = complaint_counters.unassigned + d.unassigned,
+        resolution_days = complaint_counters.resolution_days + d.resolution_days,
+        resolution_samples = complaint_counters.resolution_samples + d.resolution_samples
+"""
+
+# The same buckets recomputed from scratch
+RECOUNT_SQL = """
+    SELECT status, type, DATE(created_at) AS day,
+           COUNT(*) AS total,
+           SUM(assigned_to IS NULL) AS unassigned,
+           COALESCE(SUM(CASE WHEN status = 'Solved' THEN DATEDIFF(updated_at, created_at) END), 0) AS resolution_days,
+           COUNT(CASE WHEN status = 'Solved' THEN DATEDIFF(updated_at, created_at) END) AS resolution_samples
+    FROM complaints
+    WHERE status IS NOT NULL
+    GROUP BY status, type, DATE(created_at)
+"""
+
+# Buckets of a batch of new complaints (their ids as a JSON array)
+BATCH_COUNT_SQL = """
+    SELECT status, type, DATE(created_at) AS day,
+           COUNT(*) AS total,
+           SUM(assigned_to IS NULL) AS unassigned,
+           COALESCE(SUM(CASE WHEN status = 'Solved' THEN DATEDIFF(updated_at, created_at) END), 0) AS resolution_days,
+           COUNT(CASE WHEN status = 'Solved' THEN DATEDIFF(updated_at, created_at) END) AS resolution_samples
+    FROM complaints c
+    JOIN JSON_TABLE(%s, '$[*]' COLUMNS (id INT PATH '$')) AS batch ON batch.id = c.id
+    WHERE status IS NOT NULL
+    GROUP BY status, type, DATE(created_at)
+"""
+
+COUNTER_COLUMNS = ("total", "unassigned", "resolution_days", "resolution_samples")
+
+
+def snapshot(conn, complaint_id, lock=False):
+    """Counter contribution of one complaint, or None if it does not exist."""
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute(SNAPSHOT_SQL + (" FOR UPDATE" if lock else ""), (complaint_id,))
+        return cursor.fetchone()
+    finally:
+        cursor.close()
+
+
+def _deltas(row, sign):
+    if row is None or row["status"] is None:
+        return {}
+    resolved = row["resolution_days"] is not None
+    key = (row["status"], row["type"], row["day"])
+    return {key: (
+        sign,
+        sign * int(row["unassigned"]),
+        sign * int(row["resolution_days"] or 0),
+        sign if resolved else 0
+    )}
+
+
+def apply_change(conn, before, after):
+    """Move a complaint's contribution from its old bucket to its new one."""
+    changes = {}
+    for key, values in list(_deltas(before, -1).items()) + list(_deltas(after, 1).items()):
+        current = changes.get(key, (0, 0, 0, 0))
+        changes[key] = tuple(a + b for a, b in zip(current, values))
+
+    cursor = conn.cursor()
+    try:
+        for (status, type_, day), values in changes.items():
+            if any(values):
+                cursor.execute(UPSERT_SQL, (status, type_, day) + values)
+    finally:
+        cursor.close()
+
+
+def record_insert(conn, complaint_id):
+    apply_change(conn, None, snapshot(conn, complaint_id))
+
+
+def record_inserts(conn, complaint_ids):
+    """record_insert() for several new complaints, one upsert per bucket."""
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute(BATCH_COUNT_SQL, (json.dumps(list(complaint_ids)),))
+        rows = cursor.fetchall()
+        for r in rows:
+            values = tuple(int(r[c] or 0) for c in COUNTER_COLUMNS)
+            cursor.execute(UPSERT_SQL, (r["status"], r["type"], r["day"]) + values)
+    finally:
+        cursor.close()
+
+
+def update_complaint(conn, complaint_id, sql, params):
+    """Run a single-complaint UPDATE/DELETE and keep the counters in step.
+
+    Locks the complaint first so concurrent writers cannot double-count.
+    Returns False (and changes nothing) when the complaint does not exist.
+    The caller commits.
+    """
+    before = snapshot(conn, complaint_id, lock=True)
+    if before is None:
+        return False
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql, params)
+    finally:
+        cursor.close()
+
+    apply_change(conn, before, snapshot(conn, complaint_id))
+    return True
+
+
+# ====================
+# REBUILD / VERIFY
+# ====================
+def _fetch_buckets(conn, sql):
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute(sql)
+        return {
+            (r["status"], r["type"], r["day"]): tuple(int(r[c] or 0) for c in COUNTER_COLUMNS)
+            for r in cursor.fetchall()
+        }
+    finally:
+        cursor.close()
+
+
+def verify(conn):
+    """Compare stored counters against a full recount; returns the drifted buckets."""
+    # Both reads see the same snapshot, so in-flight writes cannot show as drift
+    conn.start_transaction(consistent_snapshot=True, readonly=True)
+    try:
+        expected = _fetch_buckets(conn, RECOUNT_SQL)
+        stored = _fetch_buckets(conn, """
+            SELECT status, type, day, total, unassigned, resolution_days, resolution_samples
+            FROM complaint_counters
+        """)
+    finally:
+        conn.rollback()
+
+    drift = []
+    for key in sorted(set(expected) | set(stored), key=str):
+        want = expected.get(key, (0, 0, 0, 0))
+        have = stored.get(key, (0, 0, 0, 0))
+        if want != have:
+            status, type_, day = key
+            drift.append({
+                "status": status,
+                "type": type_,
+                "day": str(day),
+                "expected": dict(zip(COUNTER_COLUMNS, want)),
+                "stored": dict(zip(COUNTER_COLUMNS, have))
+            })
+    return drift
+
+
+def rebuild(conn):
+    """Recompute every counter from complaints in one transaction."""
+    cursor = conn.cursor()
+    try:
+        conn.start_transaction()
+        # Block writers for the duration so no increment is lost
+        cursor.execute("SELECT id FROM complaints FOR UPDATE")
+        cursor.fetchall()
+        cursor.execute("DELETE FROM complaint_counters")
+        cursor.execute("""
+            INSERT INTO complaint_counters
+                (status, type, day, total, unassigned, resolution_days, resolution_samples)
+        """ + RECOUNT_SQL)
+        rows = cursor.rowcount
+        conn.commit()
+        return rows
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def main(argv):
+    from dotenv import load_dotenv
+    load_dotenv()
+    from config.db import get_connection
+
+    command = argv[1] if len(argv) > 1 else "verify"
+    if command not in ("verify", "rebuild"):
+        print("usage: python -m services.complaintCounters [verify|rebuild]")
+        return 2
+
+    conn = get_connection()
+    try:
+        if command == "rebuild":
+            print(f"Rebuilt complaint_counters: {rebuild(conn)} buckets")
+            return 0
+
+        drift = verify(conn)
+        for d in drift:
+            print(f"DRIFT {d['status']} / {d['type']} / {d['day']}: stored={d['stored']} expected={d['expected']}")
+        print(f"{len(drift)} drifted bucket(s)")
+        return 1 if drift else 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
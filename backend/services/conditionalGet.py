@@ -0,0 +1,90 @@
+# services/conditionalGet.py
+#
+# ETag / Last-Modified for list and detail endpoints.
+#
+# Each endpoint supplies a cheap "version" query (COUNT + MAX(updated_at)
+# of the rows it would return, say). The version is checked before the
+# view runs; when the client's If-None-Match (or If-Modified-Since) still
+# matches, the answer is an empty 304 and the rows are never fetched or
+# serialized. The version is read before the body is built, so a write
+# racing with the request can only make the ETag older than the body,
+# never newer - the client just revalidates again next time.
+import hashlib
+from datetime import timezone
+from functools import wraps
+from flask import request, g, make_response, Response
+
+from services import metrics
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def _etag(parts):
+    user_id = g.user.get("id") if getattr(g, "user", None) else None
+    raw = repr((request.full_path, user_id, parts)).encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()[:32]
+
+
+def _http_time(value):
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(microsecond=0)
+
+
+def _not_modified(etag, last_modified):
+    response = Response(status=304)
+    response.set_etag(etag, weak=True)
+    if last_modified:
+        response.last_modified = last_modified
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
+
+
+def is_fresh(etag, last_modified):
+    """Whether the request's validators still match (If-None-Match wins over If-Modified-Since)."""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def conditional(version):
+    """Answer GETs with 304 while version(**view_kwargs) is unchanged.
+
+    version returns (fingerprint, last_modified) - any repr-able value plus a
+    datetime or None - or None to skip validation (e.g. not found: let the
+    view produce its 404). Failures in version fall back to a normal 200.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != "GET":
+                return view(*args, **kwargs)
+            try:
+                state = version(**kwargs)
+            except Exception as err:
+                print("CONDITIONAL GET VERSION ERROR:", err)
+                state = None
+            if state is None:
+                return view(*args, **kwargs)
+
+            fingerprint, last_modified = state
+            etag = _etag(fingerprint)
+            last_modified = _http_time(last_modified)
+            if is_fresh(etag, last_modified):
+                metrics.conditional_get_total.inc(1, request.endpoint or "unmatched", "304")
+                return _not_modified(etag, last_modified)
+
+            metrics.conditional_get_total.inc(1, request.endpoint or "unmatched", "200")
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag, weak=True)
+                if last_modified:
+                    response.last_modified = last_modified
+                response.headers["Cache-Control"] = CACHE_CONTROL
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,156 @@
+# services/export.py
+#
+# Streaming CSV / NDJSON exports of list queries.
+#
+# The query is read in keyset order (services/pagination.py), one
+# EXPORT_BATCH_SIZE page per statement, and each page is encoded and
+# written to a chunked response before the next is fetched, so memory stays
+# flat whatever the table size. Every page checks a connection out of the
+# pool and returns it straight away: a slow or stalled client holds no
+# connection while it reads, and a client that disconnects leaves no unread
+# result behind. The request's own connection is given back before
+# streaming starts. Pages are separate statements, so rows written during
+# an export may or may not appear in it; none appears twice. With
+# "Accept-Encoding: gzip" the chunks are gzip-compressed on the fly.
+#
+# The status line is sent before the first row, so an error mid-export can
+# only cut the stream short; it is logged and the body ends there.
+import csv
+import io
+import os
+import zlib
+from datetime import datetime
+from flask import request, current_app, Response
+
+from config.db import get_connection, close_db
+from services.pagination import Page
+
+EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", "500"))
+# gzip level: 1-9, 0 disables compression even when the client accepts it
+EXPORT_GZIP_LEVEL = int(os.environ.get("EXPORT_GZIP_LEVEL", "6"))
+
+FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class InvalidExportRequest(ValueError):
+    pass
+
+
+def export_format():
+    """Format requested through ?format= (csv by default)."""
+    fmt = (request.args.get("format") or "csv").strip().lower()
+    if fmt not in FORMATS:
+        raise InvalidExportRequest(f"format must be one of: {', '.join(FORMATS)}")
+    return fmt
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return value
+
+
+def _csv_chunks(columns, batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in batches:
+        writer.writerows([_csv_value(v) for v in row] for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _ndjson_chunks(columns, batches, dumps):
+    for rows in batches:
+        yield "".join(dumps(dict(zip(columns, row))) + "\n" for row in rows).encode("utf-8")
+
+
+def _gzip(chunks):
+    compressor = zlib.compressobj(EXPORT_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _accepts_gzip():
+    return EXPORT_GZIP_LEVEL > 0 and request.accept_encodings["gzip"] > 0
+
+
+def _fetch_page(sql, params, keyset, after):
+    """One page of sql in keyset order: (column names, rows, cursor values of the last row or None)."""
+    page = Page(EXPORT_BATCH_SIZE, after)
+    page_sql, page_params = keyset.apply(sql, params, page)
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(page_sql, page_params)
+            names = list(cursor.column_names)
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+    finally:
+        conn.close()
+
+    after = None
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        last = rows[-1]
+        after = [last[names.index(key)] for _, key in keyset.columns]
+    return names, rows, after
+
+
+def stream_query(sql, params, keyset, fmt, filename):
+    """Response streaming every row of sql in keyset order as fmt.
+
+    sql must have a WHERE and no ORDER BY / LIMIT (keyset.apply() adds
+    them); keyset.hidden columns are left out. The first page is fetched
+    here, so pool and SQL errors still reach the caller as exceptions; an
+    error on a later page cuts the stream short.
+    """
+    dumps = current_app.json.dumps
+    gzip = _accepts_gzip()
+
+    # Everything the request needed from its own connection is done
+    close_db()
+    names, first, after = _fetch_page(sql, params, keyset, None)
+    keep = [i for i, name in enumerate(names) if name not in keyset.hidden]
+    columns = [names[i] for i in keep]
+
+    def batches():
+        rows, next_after = first, after
+        while rows:
+            if len(keep) < len(names):
+                rows = [tuple(row[i] for i in keep) for row in rows]
+            yield rows
+            if next_after is None:
+                return
+            _, rows, next_after = _fetch_page(sql, params, keyset, next_after)
+
+    def generate():
+        try:
+            if fmt == "csv":
+                yield from _csv_chunks(columns, batches())
+            else:
+                yield from _ndjson_chunks(columns, batches(), dumps)
+        except Exception as err:
+            print("EXPORT ERROR:", err)
+
+    body = _gzip(generate()) if gzip else generate()
+    response = Response(body, mimetype=FORMATS[fmt])
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}.{fmt}"'
+    response.headers["Cache-Control"] = "no-store"
+    response.vary.add("Accept-Encoding")
+    if gzip:
+        response.headers["Content-Encoding"] = "gzip"
+    return response
@@ -0,0 +1,165 @@
+# services/groupCommit.py
+#
+# Group commit for bursts of small inserts.
+#
+# Each addComplaint normally checks out a connection, runs its INSERT and
+# pays for its own commit (a log flush on the server). With GROUP_COMMIT=1,
+# callers hand their row to a writer thread instead and block. The writer
+# collects whatever arrives within GROUP_COMMIT_MAX_DELAY_MS (or until
+# GROUP_COMMIT_MAX_BATCH rows), writes the lot in one transaction on one
+# connection, and hands every caller its own id back. Under load, batches
+# fill while the previous commit is running; a lone request waits at most
+# the delay. Measure with python -m scripts.benchInserts.
+#
+# If a batch fails, its rows are retried one per transaction so a single
+# bad row only fails its own caller. A caller that times out while its row
+# is still queued takes the row back (nothing is written); one whose row
+# is already being written learns that it may still be saved. One writer
+# thread per process.
+import os
+import queue
+import threading
+import time
+
+from config.db import get_connection
+from services import metrics
+
+GROUP_COMMIT = os.environ.get("GROUP_COMMIT", "0") == "1"
+GROUP_COMMIT_MAX_BATCH = int(os.environ.get("GROUP_COMMIT_MAX_BATCH", "64"))
+GROUP_COMMIT_MAX_DELAY_MS = float(os.environ.get("GROUP_COMMIT_MAX_DELAY_MS", "5"))
+# Callers give up waiting for the writer after this long
+GROUP_COMMIT_TIMEOUT = float(os.environ.get("GROUP_COMMIT_TIMEOUT", "30"))
+
+
+class GroupCommitTimeout(Exception):
+    """No commit in time. in_flight: the row was being written and may still be saved."""
+
+    def __init__(self, message, in_flight):
+        super().__init__(message)
+        self.in_flight = in_flight
+
+
+class _Pending:
+    def __init__(self, row):
+        self.row = row
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self._lock = threading.Lock()
+        self._state = "queued"  # -> "writing" (writer) or "cancelled" (caller)
+
+    def take(self):
+        """Writer: claim the row unless its caller gave up."""
+        with self._lock:
+            if self._state == "cancelled":
+                return False
+            self._state = "writing"
+            return True
+
+    def cancel(self):
+        """Caller: withdraw the row if the writer has not claimed it yet."""
+        with self._lock:
+            if self._state == "queued":
+                self._state = "cancelled"
+                return True
+            return False
+
+
+class GroupCommit:
+    """Batches rows for write(conn, rows) -> one result per row; callers use submit()."""
+
+    def __init__(self, name, write, max_batch=GROUP_COMMIT_MAX_BATCH, max_delay_ms=GROUP_COMMIT_MAX_DELAY_MS):
+        self.name = name
+        self.write = write
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def submit(self, row):
+        """Write row with the next batch and return its result once committed."""
+        self._start()
+        pending = _Pending(row)
+        start = time.perf_counter()
+        self._queue.put(pending)
+        if not pending.done.wait(GROUP_COMMIT_TIMEOUT):
+            if pending.cancel():
+                raise GroupCommitTimeout(f"{self.name}: writer busy, nothing written", in_flight=False)
+            # Being written: its transaction is bounded by the database's own timeouts
+            if not pending.done.wait(GROUP_COMMIT_TIMEOUT):
+                raise GroupCommitTimeout(f"{self.name}: still being written", in_flight=True)
+        metrics.group_commit_wait.observe(time.perf_counter() - start, self.name)
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def _start(self):
+        # One writer per process (again after a fork, e.g. gunicorn --preload)
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue()
+            threading.Thread(target=self._writer, name=f"group-commit-{self.name}", daemon=True).start()
+            self._pid = os.getpid()
+
+    def _collect(self):
+        batch = []
+        while not batch:
+            pending = self._queue.get()
+            if pending.take():
+                batch.append(pending)
+        deadline = time.perf_counter() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                pending = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if pending.take():
+                batch.append(pending)
+        return batch
+
+    def _writer(self):
+        while True:
+            batch = self._collect()
+            try:
+                self._flush(batch)
+            except Exception as err:
+                # e.g. no connection: fail the whole batch
+                for pending in batch:
+                    if not pending.done.is_set():
+                        pending.error = err
+                        pending.done.set()
+
+    def _flush(self, batch):
+        conn = get_connection()
+        try:
+            try:
+                results = self.write(conn, [pending.row for pending in batch])
+                conn.commit()
+            except Exception as err:
+                conn.rollback()
+                if len(batch) == 1:
+                    batch[0].error = err
+                    batch[0].done.set()
+                    return
+                # Find the bad row(s): one transaction per row
+                for pending in batch:
+                    try:
+                        pending.result = self.write(conn, [pending.row])[0]
+                        conn.commit()
+                    except Exception as row_err:
+                        conn.rollback()
+                        pending.error = row_err
+                    pending.done.set()
+                return
+        finally:
+            conn.close()
+
+        metrics.group_commit_batch_rows.observe(len(batch), self.name)
+        for pending, result in zip(batch, results):
+            pending.result = result
+            pending.done.set()
@@ -0,0 +1,188 @@
+# services/idempotency.py
+#
+# Idempotency-Key support for writes that clients retry on flaky networks
+# (complaint submission, admin status / assign).
+#
+# The first request with a given key reserves it in the idempotency_keys
+# table (config/migrations/0005_idempotency_keys.sql), runs the view and
+# stores the response. A retry with the same key replays that response
+# ("Idempotent-Replayed: true") without running the view again. A retry
+# while the first is still running gets 409, and reusing a key for a
+# different request gets 422. Keys are per user.
+#
+# Stored responses expire after IDEMPOTENCY_TTL_SECONDS, and an
+# "idempotency.purge" job (services/jobQueue.py) deletes expired rows,
+# which keeps the table bounded. 5xx responses are not stored, so a retry
+# runs again. If the process dies mid-request, the reservation expires
+# after IDEMPOTENCY_LOCK_SECONDS and the key can be used again.
+import hashlib
+import os
+import time
+from functools import wraps
+from flask import request, jsonify, make_response, g
+
+from config.db import get_db
+from services import metrics
+from services.jobQueue import handler, enqueue
+
+IDEMPOTENCY_TTL_SECONDS = int(os.environ.get("IDEMPOTENCY_TTL_SECONDS", str(24 * 3600)))
+IDEMPOTENCY_LOCK_SECONDS = int(os.environ.get("IDEMPOTENCY_LOCK_SECONDS", "60"))
+# Each worker enqueues a purge of expired keys at most this often
+IDEMPOTENCY_PURGE_SECONDS = float(os.environ.get("IDEMPOTENCY_PURGE_SECONDS", "600"))
+PURGE_BATCH = 5000
+MAX_KEY_LENGTH = 255
+
+_last_purge = 0.0
+
+
+def _fingerprint():
+    """What makes two requests with the same key "the same request"."""
+    digest = hashlib.sha256(f"{request.method} {request.path}\n".encode())
+    if request.mimetype == "multipart/form-data":
+        # Uploads are streamed, not buffered: compare their size only
+        digest.update(str(request.content_length).encode())
+    else:
+        digest.update(request.get_data(cache=True))
+    return digest.hexdigest()
+
+
+def _reserve(conn, user_id, key, fingerprint):
+    """True if this request now owns the key, else the stored row (or None if it vanished)."""
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute("""
+            DELETE FROM idempotency_keys
+            WHERE user_id = %s AND idem_key = %s AND expires_at < NOW()
+        """, (user_id, key))
+        cursor.execute("""
+            INSERT IGNORE INTO idempotency_keys (user_id, idem_key, request_hash, expires_at)
+            VALUES (%s, %s, %s, NOW() + INTERVAL %s SECOND)
+        """, (user_id, key, fingerprint, IDEMPOTENCY_LOCK_SECONDS))
+        if cursor.rowcount == 1:
+            conn.commit()
+            return True
+        cursor.execute("""
+            SELECT request_hash, status_code, content_type, response_body
+            FROM idempotency_keys
+            WHERE user_id = %s AND idem_key = %s
+        """, (user_id, key))
+        row = cursor.fetchone()
+        conn.commit()
+        return row
+    finally:
+        cursor.close()
+
+
+def _store(conn, user_id, key, response):
+    """Keep the view's response for replays (or give the key up if there is none)."""
+    cursor = conn.cursor()
+    try:
+        if response is None or response.status_code >= 500:
+            # No result worth replaying: let a retry run again
+            cursor.execute("DELETE FROM idempotency_keys WHERE user_id = %s AND idem_key = %s", (user_id, key))
+        else:
+            cursor.execute("""
+                UPDATE idempotency_keys
+                SET status_code = %s, content_type = %s, response_body = %s,
+                    expires_at = NOW() + INTERVAL %s SECOND
+                WHERE user_id = %s AND idem_key = %s
+            """, (response.status_code, response.content_type, response.get_data(),
+                  IDEMPOTENCY_TTL_SECONDS, user_id, key))
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def _discard_view_work():
+    """Roll back what a failed view left uncommitted on the request connection.
+
+    _store() commits on that connection; without this it would commit a
+    half-done write (say, a complaint whose counter update failed) that the
+    teardown rollback in config/db.py would otherwise have undone.
+    """
+    get_db().rollback()
+
+
+def _schedule_purge():
+    global _last_purge
+    now = time.monotonic()
+    if now - _last_purge >= IDEMPOTENCY_PURGE_SECONDS:
+        _last_purge = now
+        enqueue("idempotency.purge")
+
+
+def idempotent(view):
+    """Honour an Idempotency-Key header on a write view.
+
+    Apply it below @authenticate_token (keys are scoped to g.user). Requests
+    without the header run as before.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get("Idempotency-Key")
+        if key is None:
+            return view(*args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return jsonify({"message": f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters"}), 400
+
+        user_id = g.user["id"]
+        fingerprint = _fingerprint()
+        try:
+            conn = get_db()
+            reserved = _reserve(conn, user_id, key, fingerprint)
+        except Exception as err:
+            return jsonify({"message": "Error checking Idempotency-Key", "error": str(err)}), 500
+
+        if reserved is not True:
+            if reserved is not None and reserved["request_hash"] != fingerprint:
+                metrics.idempotency_total.inc(1, request.endpoint, "mismatch")
+                return jsonify({"message": "Idempotency-Key was already used for a different request"}), 422
+            # None: the row expired between our statements; the retry will take it
+            if reserved is None or reserved["status_code"] is None:
+                metrics.idempotency_total.inc(1, request.endpoint, "conflict")
+                response = jsonify({"message": "Request with this Idempotency-Key is in progress"})
+                response.headers["Retry-After"] = "1"
+                return response, 409
+            metrics.idempotency_total.inc(1, request.endpoint, "replayed")
+            response = make_response(bytes(reserved["response_body"] or b""), reserved["status_code"])
+            if reserved["content_type"]:
+                response.headers["Content-Type"] = reserved["content_type"]
+            response.headers["Idempotent-Replayed"] = "true"
+            return response
+
+        metrics.idempotency_total.inc(1, request.endpoint, "new")
+        try:
+            response = make_response(view(*args, **kwargs))
+        except BaseException:
+            try:
+                _discard_view_work()
+                _store(get_db(), user_id, key, None)
+            except Exception as err:
+                print("IDEMPOTENCY STORE ERROR:", err)
+            raise
+        try:
+            if not 200 <= response.status_code < 300:
+                _discard_view_work()
+            _store(get_db(), user_id, key, response)
+            _schedule_purge()
+        except Exception as err:
+            # The write is done; a retry within IDEMPOTENCY_LOCK_SECONDS gets 409
+            print("IDEMPOTENCY STORE ERROR:", err)
+        return response
+    return wrapper
+
+
+@handler("idempotency.purge")
+def purge_expired(payload):
+    """Delete expired keys, PURGE_BATCH rows per transaction."""
+    conn = get_db()
+    cursor = conn.cursor()
+    try:
+        while True:
+            cursor.execute("DELETE FROM idempotency_keys WHERE expires_at < NOW() LIMIT %s", (PURGE_BATCH,))
+            deleted = cursor.rowcount
+            conn.commit()
+            if deleted < PURGE_BATCH:
+                break
+    finally:
+        cursor.close()
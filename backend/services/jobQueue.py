@@ -0,0 +1,270 @@
+# services/jobQueue.py
+#
+# Durable background jobs without an extra service.
+#
+# Jobs live in a local SQLite file (JOB_QUEUE_PATH) and are run by a small
+# pool of daemon threads in each app process, inside an app context so
+# handlers can use get_db() like a request does. Controllers call
+#   enqueue("attachment.release", {"attachment_id": 7})
+# after their own commit and return; handlers are registered with
+#   @handler("attachment.release")
+#
+# A failing job is retried with exponential backoff (JOB_BACKOFF_SECONDS,
+# doubled per attempt, capped at JOB_BACKOFF_MAX) up to JOB_MAX_ATTEMPTS,
+# then kept with state 'failed' for inspection. A claimed job carries a
+# lease (JOB_LEASE_SECONDS); if its process dies, another worker picks it
+# up when the lease runs out. Jobs can therefore run more than once, so
+# handlers must be idempotent.
+#
+# Inspect from the command line (run from backend/):
+#   python -m services.jobQueue status
+#   python -m services.jobQueue retry-failed
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import traceback
+
+from services import metrics
+
+JOB_QUEUE_PATH = os.environ.get("JOB_QUEUE_PATH", os.path.join("data", "jobs.sqlite3"))
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "2"))  # per process; 0 = enqueue only
+JOB_MAX_ATTEMPTS = int(os.environ.get("JOB_MAX_ATTEMPTS", "5"))
+JOB_BACKOFF_SECONDS = float(os.environ.get("JOB_BACKOFF_SECONDS", "2"))
+JOB_BACKOFF_MAX = float(os.environ.get("JOB_BACKOFF_MAX", "300"))
+JOB_LEASE_SECONDS = float(os.environ.get("JOB_LEASE_SECONDS", "300"))
+# Idle workers poll this often for jobs enqueued by other processes
+JOB_POLL_SECONDS = 1.0
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        state TEXT NOT NULL DEFAULT 'queued',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        run_at REAL NOT NULL,
+        locked_until REAL,
+        last_error TEXT,
+        created_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_jobs_due ON jobs (state, run_at);
+"""
+
+_handlers = {}
+
+jobs_total = metrics.registry.register(metrics.Counter(
+    "jobs_total", "Background jobs by kind and outcome (enqueued / done / retry / failed).",
+    ("kind", "outcome")))
+job_duration = metrics.registry.register(metrics.Histogram(
+    "job_duration_seconds", "Background job run time by kind.", ("kind",)))
+
+
+def handler(kind):
+    """Decorator: run fn(payload) for jobs of this kind."""
+    def decorator(fn):
+        _handlers[kind] = fn
+        return fn
+    return decorator
+
+
+def backoff(attempts):
+    """Seconds to wait before retry number attempts (1, 2, ...)."""
+    return min(JOB_BACKOFF_SECONDS * (2 ** (attempts - 1)), JOB_BACKOFF_MAX)
+
+
+class JobQueue:
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._wake = threading.Condition()
+        self._lock = threading.Lock()
+        self._workers = []
+        self._pid = None
+        self._app = None
+        self._schema_ready = False
+
+    # --- storage ---
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Autocommit; claims take the write lock with BEGIN IMMEDIATE
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            if not self._schema_ready:
+                conn.executescript(SCHEMA)
+                self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, kind, payload=None, delay=0):
+        """Store a job and wake a worker; returns the job id."""
+        now = time.time()
+        cursor = self._conn().execute(
+            "INSERT INTO jobs (kind, payload, run_at, created_at) VALUES (?, ?, ?, ?)",
+            (kind, json.dumps(payload or {}), now + delay, now)
+        )
+        jobs_total.inc(1, kind, "enqueued")
+        self.start()
+        with self._wake:
+            self._wake.notify()
+        return cursor.lastrowid
+
+    def claim(self):
+        """Lease the next due job: (id, kind, payload, attempts) or None."""
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("""
+                SELECT id, kind, payload, attempts FROM jobs
+                WHERE (state = 'queued' AND run_at <= ?)
+                   OR (state = 'running' AND locked_until <= ?)
+                ORDER BY run_at, id
+                LIMIT 1
+            """, (now, now)).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET state = 'running', attempts = attempts + 1, locked_until = ? WHERE id = ?",
+                (now + JOB_LEASE_SECONDS, row[0])
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        job_id, kind, payload, attempts = row
+        return job_id, kind, json.loads(payload), attempts + 1
+
+    def _finish(self, job_id):
+        self._conn().execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def _fail(self, job_id, attempts, error):
+        if attempts >= JOB_MAX_ATTEMPTS:
+            self._conn().execute(
+                "UPDATE jobs SET state = 'failed', locked_until = NULL, last_error = ? WHERE id = ?",
+                (error, job_id)
+            )
+            return "failed"
+        self._conn().execute(
+            "UPDATE jobs SET state = 'queued', locked_until = NULL, run_at = ?, last_error = ? WHERE id = ?",
+            (time.time() + backoff(attempts), error, job_id)
+        )
+        return "retry"
+
+    def _next_due(self):
+        row = self._conn().execute(
+            "SELECT MIN(run_at) FROM jobs WHERE state = 'queued'"
+        ).fetchone()
+        return row[0] if row else None
+
+    # --- running ---
+    def run_one(self):
+        """Claim and run one due job; False when there was none."""
+        job = self.claim()
+        if job is None:
+            return False
+        job_id, kind, payload, attempts = job
+        fn = _handlers.get(kind)
+        start = time.perf_counter()
+        try:
+            if fn is None:
+                raise LookupError(f"No handler registered for job kind {kind!r}")
+            if self._app is not None:
+                with self._app.app_context():
+                    fn(payload)
+            else:
+                fn(payload)
+        except Exception as err:
+            outcome = self._fail(job_id, attempts, f"{type(err).__name__}: {err}")
+            print(f"JOB {kind} #{job_id} attempt {attempts} failed ({outcome}):", err)
+            traceback.print_exc()
+        else:
+            outcome = "done"
+            self._finish(job_id)
+        jobs_total.inc(1, kind, outcome)
+        job_duration.observe(time.perf_counter() - start, kind)
+        return True
+
+    def _worker(self):
+        while True:
+            try:
+                if self.run_one():
+                    continue
+                due = self._next_due()
+                wait = JOB_POLL_SECONDS if due is None else min(max(due - time.time(), 0.01), JOB_POLL_SECONDS)
+            except Exception as err:
+                print("JOB QUEUE ERROR:", err)
+                wait = JOB_POLL_SECONDS
+            with self._wake:
+                self._wake.wait(wait)
+
+    def start(self):
+        """Start this process's workers (again after a fork, e.g. gunicorn --preload)."""
+        if not JOB_WORKERS or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._workers = [
+                threading.Thread(target=self._worker, name=f"job-worker-{i}", daemon=True)
+                for i in range(JOB_WORKERS)
+            ]
+            for thread in self._workers:
+                thread.start()
+
+    def stats(self):
+        rows = self._conn().execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        return {state: count for state, count in rows}
+
+
+queue = JobQueue(JOB_QUEUE_PATH)
+
+metrics.registry.register(metrics.Gauge(
+    "job_queue_pending", "Jobs queued or running (all processes sharing the file).",
+    lambda: sum(n for state, n in queue.stats().items() if state != "failed")))
+metrics.registry.register(metrics.Gauge(
+    "job_queue_failed", "Jobs that used up their attempts.", lambda: queue.stats().get("failed", 0)))
+
+
+def enqueue(kind, payload=None, delay=0):
+    return queue.enqueue(kind, payload, delay)
+
+
+def init_app(app):
+    queue._app = app
+    # Workers start with the first request in each process (after any fork)
+    app.before_request(queue.start)
+
+
+def main(argv):
+    command = argv[1] if len(argv) > 1 else "status"
+    conn = queue._conn()
+    if command == "status":
+        print(json.dumps(queue.stats(), indent=2))
+        for row in conn.execute(
+            "SELECT id, kind, attempts, last_error FROM jobs WHERE state = 'failed' ORDER BY id"
+        ):
+            print("failed #%d %s (attempts %d): %s" % row)
+        return 0
+    if command == "retry-failed":
+        changed = conn.execute(
+            "UPDATE jobs SET state = 'queued', attempts = 0, run_at = ? WHERE state = 'failed'",
+            (time.time(),)
+        ).rowcount
+        print(f"re-queued {changed} failed jobs")
+        return 0
+    print("usage: python -m services.jobQueue [status|retry-failed]")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
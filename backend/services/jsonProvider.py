@@ -0,0 +1,79 @@
+# services/jsonProvider.py
+#
+# Flask JSON provider backed by orjson when it is installed, with Flask's
+# stdlib provider as the fallback (and for pretty-printed debug output).
+#
+# Output matches the default provider value for value: datetimes and dates
+# are HTTP dates ("Thu, 01 Oct 2026 12:00:00 GMT"), Decimal becomes a
+# string, and a trailing newline is added. Keys are not sorted.
+import dataclasses
+import decimal
+import uuid
+from datetime import date, datetime, timezone
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import http_date
+
+try:
+    import orjson
+except ImportError:  # optional: pip install orjson
+    orjson = None
+
+if orjson is not None:
+    # Dates go through _default so they keep Flask's HTTP-date format
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+else:
+    ORJSON_OPTIONS = 0
+
+
+_DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def _http_date(o):
+    """werkzeug.http.http_date for datetimes, without the email.utils round trip.
+
+    Naive values are UTC (as in werkzeug); every DATETIME column comes back
+    naive, so this is the path taken once per timestamp in a list response.
+    """
+    if o.tzinfo is not None and o.tzinfo is not timezone.utc:
+        o = o.astimezone(timezone.utc)
+    return (f"{_DAYS[o.weekday()]}, {o.day:02d} {_MONTHS[o.month - 1]} {o.year:04d} "
+            f"{o.hour:02d}:{o.minute:02d}:{o.second:02d} GMT")
+
+
+def _default(o):
+    """Same conversions as flask.json.provider._default."""
+    if isinstance(o, datetime):
+        return _http_date(o)
+    if isinstance(o, date):
+        return http_date(o)
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses and dataclasses.is_dataclass(o):
+        return dataclasses.asdict(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    @property
+    def fast(self):
+        return orjson is not None and not (self.compact is False or (self.compact is None and self._app.debug))
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if not self.fast:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS) + b"\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
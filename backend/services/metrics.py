@@ -0,0 +1,166 @@
+# services/metrics.py
+#
+# Minimal in-process metrics registry rendered in the Prometheus text format
+# (served at /api/metrics by middleware/metricsMiddleware.py).
+#
+# Values are per process: with several gunicorn workers each one reports its
+# own series, so scrape every worker or aggregate with sum() in queries.
+import threading
+
+# Seconds; tuned for web requests and single SQL statements
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, amount=1, *label_values):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            lines.append(f"{self.name}{_labels(self.label_names, label_values)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._lock = threading.Lock()
+        # label values -> [per-bucket counts, sum, count]
+        self._series = {}
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1], v[2])) for k, v in self._series.items())
+        for label_values, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, label_values, le)} {cumulative}")
+            base = _labels(self.label_names, label_values)
+            lines.append(f"{self.name}_sum{base} {_number(round(total, 6))}")
+            lines.append(f"{self.name}_count{base} {count}")
+        return lines
+
+
+class Gauge:
+    """Value read from a callback at scrape time."""
+
+    def __init__(self, name, help_text, read):
+        self.name = name
+        self.help = help_text
+        self.read = read
+
+    def render(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge",
+                f"{self.name} {_number(self.read())}"]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# --- HTTP (recorded by middleware/metricsMiddleware.py) ---
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "Request latency per endpoint.", ("endpoint", "method")))
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "Requests per endpoint and status code.", ("endpoint", "method", "status")))
+
+# --- Auth (recorded by middleware/authMiddleware.py) ---
+token_cache_total = registry.register(Counter(
+    "auth_token_cache_total", "Verified-token cache lookups by result.", ("result",)))
+
+# --- Response cache (recorded by services/responseCache.py) ---
+response_cache_total = registry.register(Counter(
+    "response_cache_total", "Admin/staff response cache lookups by result.", ("result",)))
+
+# --- Request coalescing (recorded by services/singleFlight.py) ---
+single_flight_total = registry.register(Counter(
+    "single_flight_total", "Coalesced calls by name and role (leader / shared / timeout).",
+    ("name", "role")))
+
+# --- Conditional GET (recorded by services/conditionalGet.py) ---
+conditional_get_total = registry.register(Counter(
+    "conditional_get_total", "Validated GETs by endpoint and outcome (304 / 200).",
+    ("endpoint", "status")))
+
+# --- Database (recorded by config/db.py) ---
+db_query_duration = registry.register(Histogram(
+    "db_query_duration_seconds", "SQL statement latency (execute + fetch) per calling function.",
+    ("caller", "verb")))
+db_query_rows_total = registry.register(Counter(
+    "db_query_rows_total", "Rows returned (SELECT) or affected (writes) per calling function.",
+    ("caller", "verb")))
+db_pool_wait = registry.register(Histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled connection."))
+
+# --- Group commit (recorded by services/groupCommit.py) ---
+group_commit_batch_rows = registry.register(Histogram(
+    "group_commit_batch_rows", "Rows written per group-commit transaction.", ("name",),
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256)))
+group_commit_wait = registry.register(Histogram(
+    "group_commit_wait_seconds", "Time a caller waited for its row to be committed.", ("name",)))
+
+# --- Idempotency keys (recorded by services/idempotency.py) ---
+idempotency_total = registry.register(Counter(
+    "idempotency_total", "Requests with an Idempotency-Key by endpoint and outcome (new / replayed / conflict / mismatch).",
+    ("endpoint", "outcome")))
@@ -0,0 +1,152 @@
+# services/pagination.py
+#
+# Keyset (cursor) pagination for the list endpoints.
+#
+# Paging is opt-in: without ?limit= or ?cursor= an endpoint returns the plain
+# JSON list it always has. With either one it returns
+#   {"items": [...], "next_cursor": "<opaque>" | null}
+# and the client passes next_cursor back as ?cursor= for the following page.
+import base64
+import json
+from datetime import date, datetime
+from flask import request, jsonify
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+class InvalidPageRequest(ValueError):
+    pass
+
+
+class Page:
+    def __init__(self, limit, after=None):
+        self.limit = limit
+        self.after = after
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return ["dt", value.isoformat()]
+    if isinstance(value, date):
+        return ["d", value.isoformat()]
+    return ["v", value]
+
+
+def _decode_value(item):
+    # The cursor comes from the client: accept only what _encode_value makes
+    if not isinstance(item, list) or len(item) != 2:
+        raise ValueError("cursor item must be [kind, value]")
+    kind, value = item
+    if kind == "dt":
+        return datetime.fromisoformat(value)
+    if kind == "d":
+        return date.fromisoformat(value)
+    if kind == "v" and isinstance(value, (int, float, str)) and not isinstance(value, bool):
+        return value
+    raise ValueError("unsupported cursor value")
+
+
+def encode_cursor(values):
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token):
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        items = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(items, list):
+            raise ValueError("cursor must be a list")
+        return [_decode_value(item) for item in items]
+    except Exception:
+        raise InvalidPageRequest("Invalid cursor")
+
+
+def get_page_request():
+    """Page requested through ?limit=&cursor=, or None for a legacy full-list call."""
+    limit = request.args.get("limit")
+    cursor = request.args.get("cursor")
+    if limit is None and cursor is None:
+        return None
+
+    try:
+        limit = int(limit) if limit else DEFAULT_LIMIT
+    except ValueError:
+        raise InvalidPageRequest("limit must be an integer")
+    if limit < 1:
+        raise InvalidPageRequest("limit must be positive")
+
+    return Page(min(limit, MAX_LIMIT), decode_cursor(cursor) if cursor else None)
+
+
+class Keyset:
+    """Sort key for a list query, e.g. Keyset(("c.created_at", "created_at"), ("c.id", "id")).
+
+    Each column is (SQL expression, key of that value in the fetched row).
+    The last column must be unique so the order is total. Keys listed in
+    hidden (e.g. a search relevance score) are only needed for the cursor
+    and are dropped from the items once it is built.
+    """
+
+    def __init__(self, *columns, descending=True, hidden=()):
+        self.columns = columns
+        self.descending = descending
+        self.hidden = tuple(hidden)
+
+    def _seek(self, after):
+        # (a, b) < (x, y)  ->  a < x OR (a = x AND b < y), which MySQL can range-scan
+        op = "<" if self.descending else ">"
+        clauses, params = [], []
+        for i, (expr, _) in enumerate(self.columns):
+            parts = [f"{prev} = %s" for prev, _ in self.columns[:i]] + [f"{expr} {op} %s"]
+            clauses.append("(" + " AND ".join(parts) + ")")
+            params.extend(after[:i + 1])
+        return "(" + " OR ".join(clauses) + ")", params
+
+    def apply(self, sql, params, page):
+        """Append the seek predicate, ORDER BY and LIMIT; sql must already have a WHERE."""
+        params = list(params)
+        if page and page.after is not None:
+            if len(page.after) != len(self.columns):
+                raise InvalidPageRequest("Invalid cursor")
+            seek_sql, seek_params = self._seek(page.after)
+            sql += " AND " + seek_sql
+            params.extend(seek_params)
+
+        direction = "DESC" if self.descending else "ASC"
+        sql += " ORDER BY " + ", ".join(f"{expr} {direction}" for expr, _ in self.columns)
+
+        if page:
+            # One extra row tells us whether another page exists
+            sql += " LIMIT %s"
+            params.append(page.limit + 1)
+        return sql, params
+
+    def _strip(self, items):
+        if self.hidden:
+            for item in items:
+                for key in self.hidden:
+                    item.pop(key, None)
+        return items
+
+    def respond(self, items, rows, page):
+        """jsonify the shaped items; rows are the raw fetched rows they came from.
+
+        items may be the rows themselves when the SQL already selects the
+        response fields under their final names. rows may be dicts or the
+        NamedTuple rows of models/rows.py.
+        """
+        if page is None:
+            return jsonify(self._strip(items))
+
+        next_cursor = None
+        if len(rows) > page.limit:
+            last = rows[page.limit - 1]
+            if isinstance(last, dict):
+                values = [last[key] for _, key in self.columns]
+            else:
+                # Typed rows from models/rows.py
+                values = [getattr(last, key) for _, key in self.columns]
+            next_cursor = encode_cursor(values)
+        return jsonify({"items": self._strip(items[:page.limit]), "next_cursor": next_cursor})
@@ -0,0 +1,91 @@
+# services/passwords.py
+#
+# bcrypt hashing on a dedicated, bounded thread pool.
+#
+# bcrypt releases the GIL, so the pool lets hashes run in parallel with the
+# rest of the worker while capping how many CPU-heavy hashes run at once.
+# When BCRYPT_QUEUE_LIMIT hashes are already running or waiting, new ones
+# are refused with PasswordBusy (the controllers answer 503) instead of
+# piling up behind a login storm.
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import bcrypt
+
+from services import metrics
+
+# Target cost for new hashes; logins rehash stored hashes with another cost
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))
+BCRYPT_WORKERS = int(os.environ.get("BCRYPT_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Running + waiting hashes allowed before shedding load
+BCRYPT_QUEUE_LIMIT = int(os.environ.get("BCRYPT_QUEUE_LIMIT", str(BCRYPT_WORKERS * 8)))
+# Seconds a request waits for its hash before giving up
+BCRYPT_TIMEOUT = float(os.environ.get("BCRYPT_TIMEOUT", "10"))
+
+
+class PasswordBusy(Exception):
+    """The hashing queue is full; retry later."""
+
+
+_executor = ThreadPoolExecutor(max_workers=BCRYPT_WORKERS, thread_name_prefix="bcrypt")
+_slots = threading.BoundedSemaphore(BCRYPT_QUEUE_LIMIT)
+_inflight = [0]
+_inflight_lock = threading.Lock()
+
+metrics.registry.register(metrics.Gauge(
+    "password_hash_inflight", "bcrypt operations running or queued.", lambda: _inflight[0]))
+password_hash_shed = metrics.registry.register(metrics.Counter(
+    "password_hash_shed_total", "bcrypt operations refused because the queue was full."))
+
+
+def _release(_future):
+    with _inflight_lock:
+        _inflight[0] -= 1
+    _slots.release()
+
+
+def _run(fn, *args):
+    if not _slots.acquire(blocking=False):
+        password_hash_shed.inc()
+        raise PasswordBusy("Too many password operations in progress")
+    with _inflight_lock:
+        _inflight[0] += 1
+    try:
+        future = _executor.submit(fn, *args)
+    except Exception:
+        _release(None)
+        raise
+    future.add_done_callback(_release)
+    try:
+        return future.result(timeout=BCRYPT_TIMEOUT)
+    except FutureTimeout:
+        raise PasswordBusy(f"Password operation did not finish within {BCRYPT_TIMEOUT:.0f}s")
+
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=rounds)).decode("utf-8")
+
+
+def _check(password, hashed):
+    return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+
+
+def hash_password(password, rounds=None):
+    return _run(_hash, password, rounds or BCRYPT_ROUNDS)
+
+
+def check_password(password, hashed):
+    return _run(_check, password, hashed)
+
+
+def hash_cost(hashed):
+    """Cost factor of a "$2b$12$..." hash, or None if it is not bcrypt."""
+    parts = hashed.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(hashed):
+    return hash_cost(hashed) != BCRYPT_ROUNDS
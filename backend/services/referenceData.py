@@ -0,0 +1,85 @@
+# services/referenceData.py
+#
+# In-process cache of small, rarely changing lookup data: the roles table
+# and the authorized-staff dropdown.
+#
+# Writes in this worker invalidate immediately (invalidate_staff() from
+# updateStaffStatus / deleteUser). Other gunicorn workers keep their copy
+# until REFERENCE_CACHE_TTL expires, which bounds how stale a list can be.
+import os
+import threading
+import time
+from config.db import get_db
+
+REFERENCE_CACHE_TTL = float(os.environ.get("REFERENCE_CACHE_TTL", "300"))
+
+_lock = threading.Lock()
+# name -> (value, loaded_at)
+_entries = {}
+# Bumped by every invalidation so a load that raced with a write is not stored
+_generation = [0]
+
+
+def _cached(name, load):
+    now = time.monotonic()
+    with _lock:
+        cached = _entries.get(name)
+        if cached and now - cached[1] < REFERENCE_CACHE_TTL:
+            return cached[0]
+        generation = _generation[0]
+
+    value = load()
+    with _lock:
+        if generation == _generation[0]:
+            _entries[name] = (value, now)
+    return value
+
+
+def _load_roles():
+    cursor = get_db().cursor()
+    try:
+        cursor.execute("SELECT id, name FROM roles")
+        return {name.lower(): role_id for role_id, name in cursor.fetchall()}
+    finally:
+        cursor.close()
+
+
+def roles():
+    """{lowercase role name: role id}"""
+    return _cached("roles", _load_roles)
+
+
+def role_id(name):
+    """Id of a role by (case-insensitive) name, or None if there is no such role."""
+    return roles().get((name or "").strip().lower())
+
+
+def _load_authorized_staff():
+    cursor = get_db().cursor(dictionary=True)
+    try:
+        cursor.execute("""
+            SELECT u.id, CONCAT(u.first_name,' ',u.last_name) AS name
+            FROM users u
+            WHERE u.role_id = %s AND u.staff_status = 'Authorized'
+            ORDER BY u.first_name
+        """, (role_id("staff") or 0,))
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def authorized_staff():
+    """[{"id", "name"}] for the assign-to dropdown (a fresh list each call)."""
+    return [dict(row) for row in _cached("authorized_staff", _load_authorized_staff)]
+
+
+def invalidate_staff():
+    with _lock:
+        _generation[0] += 1
+        _entries.pop("authorized_staff", None)
+
+
+def invalidate():
+    with _lock:
+        _generation[0] += 1
+        _entries.clear()
@@ -0,0 +1,176 @@
+# services/responseCache.py
+#
+# Per-worker cache of GET responses for the admin and staff read endpoints.
+#
+# Entries are keyed by endpoint + view args + normalized query string and
+# carry tags naming the data they were built from ("complaints", "users",
+# "complaint:42"). Controllers call invalidate(...) with the tags a write
+# touches, so a new comment evicts only that complaint's detail view while
+# a status change evicts every list and statistic. TTL bounds how stale
+# another worker's copy can get; LRU bounds memory.
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import request, make_response
+
+from services import metrics
+
+RESPONSE_CACHE_SIZE = int(os.environ.get("RESPONSE_CACHE_SIZE", "512"))
+RESPONSE_CACHE_TTL = float(os.environ.get("RESPONSE_CACHE_TTL", "30"))
+# Response headers kept with a cached body (validators from services/conditionalGet.py)
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control")
+
+# Tags used by the controllers
+COMPLAINTS = "complaints"  # any complaint row (lists, counts, statistics)
+USERS = "users"            # user names / roles / staff status
+
+
+def complaint_tag(complaint_id):
+    """One complaint's detail view (its comments included)."""
+    return f"complaint:{complaint_id}"
+
+
+class ResponseCache:
+    def __init__(self, size, ttl):
+        self.size = size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires, tags, status, headers, body)
+        self._tagged = {}              # tag -> set(keys)
+        # Bumped per tag on invalidation so a response computed before the
+        # write finished is not stored afterwards
+        self._versions = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry:
+            for tag in entry[1]:
+                keys = self._tagged.get(tag)
+                if keys:
+                    keys.discard(key)
+                    if not keys:
+                        del self._tagged[tag]
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                metrics.response_cache_total.inc(1, "hit")
+                return entry
+            if entry:
+                self._drop(key)
+            self.misses += 1
+        metrics.response_cache_total.inc(1, "miss")
+        return None
+
+    def versions(self, tags):
+        with self._lock:
+            return tuple(self._versions.get(tag, 0) for tag in tags)
+
+    def put(self, key, tags, versions, status, headers, body, ttl=None):
+        with self._lock:
+            if versions != tuple(self._versions.get(tag, 0) for tag in tags):
+                return
+            self._drop(key)
+            self._entries[key] = (time.monotonic() + (ttl or self.ttl), tags, status, headers, body)
+            for tag in tags:
+                self._tagged.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.size:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate(self, *tags):
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+                for key in list(self._tagged.get(tag, ())):
+                    self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            for tag in list(self._tagged):
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+            self._entries.clear()
+            self._tagged.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "capacity": self.size,
+                "ttlSeconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRatio": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+response_cache = ResponseCache(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL)
+
+
+def invalidate(*tags):
+    response_cache.invalidate(*tags)
+
+
+def _query_key():
+    """Query args sorted by name, empty values dropped (controllers treat them as absent)."""
+    items = []
+    for name in sorted(request.args):
+        values = [v.strip() for v in request.args.getlist(name) if v.strip()]
+        if values:
+            items.append((name, tuple(values)))
+    return tuple(items)
+
+
+def _resolve_tags(tags, kwargs):
+    resolved = []
+    for tag in tags:
+        value = tag(**kwargs) if callable(tag) else tag
+        if isinstance(value, (list, tuple)):
+            resolved.extend(value)
+        else:
+            resolved.append(value)
+    return tuple(resolved)
+
+
+def cached(*tags, ttl=None):
+    """Cache a GET view's 200 responses under the given tags.
+
+    A tag may be a callable taking the view's keyword args, e.g.
+    ``lambda id: complaint_tag(id)`` for a detail route; it may return a
+    list of tags (say, one per id in the query string). Apply it below
+    @authenticate_token so authentication still runs on every request.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not RESPONSE_CACHE_SIZE or request.method != "GET":
+                return view(*args, **kwargs)
+
+            key = (request.endpoint, tuple(sorted(kwargs.items())), _query_key())
+            entry = response_cache.get(key)
+            if entry is not None:
+                _, _, status, headers, body = entry
+                response = make_response(body, status)
+                response.headers.update(headers)
+                response.headers["X-Cache"] = "HIT"
+                # A cached ETag still answers If-None-Match with 304
+                return response.make_conditional(request)
+
+            entry_tags = _resolve_tags(tags, kwargs)
+            versions = response_cache.versions(entry_tags)
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+                response_cache.put(key, entry_tags, versions, response.status_code,
+                                   headers, response.get_data(), ttl)
+            response.headers["X-Cache"] = "MISS"
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,138 @@
+# services/search.py
+#
+# Search filters for the complaint and user lists.
+#
+# Large tables are searched through the FULLTEXT indexes added in
+# config/migrations/0001_fulltext_search.sql: every word the user typed must
+# match as a prefix ("+word*" in BOOLEAN MODE), and each hit carries a
+# relevance score the lists can rank by. Tables below SEARCH_FULLTEXT_MIN_ROWS
+# keep the original LIKE '%term%' filter, which is exact and cheap there.
+import os
+import re
+import threading
+import time
+from config.db import get_db
+
+SEARCH_FULLTEXT_MIN_ROWS = int(os.environ.get("SEARCH_FULLTEXT_MIN_ROWS", "2000"))
+# How long a table size estimate is trusted before asking MySQL again
+TABLE_SIZE_TTL = 300
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+_size_lock = threading.Lock()
+_table_sizes = {}
+
+
+class SearchPlan:
+    """SQL pieces a list query splices in for one search term.
+
+    join    - goes straight after the FROM table (fulltext only)
+    where   - appended after the WHERE clause (LIKE fallback only)
+    columns - extra SELECT columns (the relevance score when ranked)
+    """
+
+    def __init__(self, join="", join_params=(), where="", where_params=(), columns="", ranked=False):
+        self.join = join
+        self.join_params = list(join_params)
+        self.where = where
+        self.where_params = list(where_params)
+        self.columns = columns
+        self.ranked = ranked
+
+
+NO_SEARCH = SearchPlan()
+
+
+def table_size(table):
+    """Estimated row count from information_schema, cached for TABLE_SIZE_TTL seconds."""
+    now = time.monotonic()
+    with _size_lock:
+        cached = _table_sizes.get(table)
+        if cached and now - cached[1] < TABLE_SIZE_TTL:
+            return cached[0]
+
+    cursor = get_db().cursor()
+    try:
+        cursor.execute("""
+            SELECT TABLE_ROWS FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """, (table,))
+        row = cursor.fetchone()
+    finally:
+        cursor.close()
+
+    size = int(row[0] or 0) if row else 0
+    with _size_lock:
+        _table_sizes[table] = (size, now)
+    return size
+
+
+def boolean_query(term):
+    """'water lea' -> '+water* +lea*' (every word required, prefix match)."""
+    words = _WORD_RE.findall(term)
+    return " ".join(f"+{w}*" for w in words) if words else None
+
+
+def _like_plan(term, like_columns):
+    pattern = f"%{term}%"
+    where = " AND (" + " OR ".join(f"{col} LIKE %s" for col in like_columns) + ")"
+    return SearchPlan(where=where, where_params=[pattern] * len(like_columns))
+
+
+def complaint_search(term, like_columns, alias="c"):
+    """Search complaints by subject/type, submitter name or exact id.
+
+    like_columns is the endpoint's original LIKE column list, used on small tables.
+    """
+    term = (term or "").strip()
+    if not term:
+        return NO_SEARCH
+
+    query = boolean_query(term)
+    if query is None or table_size("complaints") < SEARCH_FULLTEXT_MIN_ROWS:
+        return _like_plan(term, like_columns)
+
+    # Each branch is served by its own index; the best score per complaint wins
+    branches = [
+        """SELECT id, MATCH(subject, type) AGAINST (%s IN BOOLEAN MODE) AS score
+           FROM complaints
+           WHERE MATCH(subject, type) AGAINST (%s IN BOOLEAN MODE)""",
+        """SELECT sc.id, MATCH(su.first_name, su.last_name) AGAINST (%s IN BOOLEAN MODE) AS score
+           FROM users su
+           JOIN complaints sc ON sc.user_id = su.id
+           WHERE MATCH(su.first_name, su.last_name) AGAINST (%s IN BOOLEAN MODE)"""
+    ]
+    params = [query] * 4
+    if term.isdigit():
+        branches.append("SELECT id, 1000 AS score FROM complaints WHERE id = %s")
+        params.append(int(term))
+
+    join = f"""
+            JOIN (
+                SELECT id, MAX(score) AS relevance
+                FROM ({" UNION ALL ".join(branches)}) hits
+                GROUP BY id
+            ) s ON s.id = {alias}.id
+    """
+    return SearchPlan(join=join, join_params=params, columns=", s.relevance", ranked=True)
+
+
+def user_search(term, alias="u"):
+    """Search users by first name, last name or email."""
+    term = (term or "").strip()
+    if not term:
+        return NO_SEARCH
+
+    like_columns = (f"{alias}.first_name", f"{alias}.last_name", f"{alias}.email")
+    query = boolean_query(term)
+    if query is None or table_size("users") < SEARCH_FULLTEXT_MIN_ROWS:
+        return _like_plan(term, like_columns)
+
+    join = f"""
+            JOIN (
+                SELECT id, MATCH(first_name, last_name, email) AGAINST (%s IN BOOLEAN MODE) AS relevance
+                FROM users
+                WHERE MATCH(first_name, last_name, email) AGAINST (%s IN BOOLEAN MODE)
+            ) s ON s.id = {alias}.id
+    """
+    return SearchPlan(join=join, join_params=[query, query], columns=", s.relevance", ranked=True)
@@ -0,0 +1,83 @@
+# services/singleFlight.py
+#
+# Request coalescing: concurrent callers asking for the same key within one
+# worker wait for a single in-flight computation and share its result
+# instead of each running the same queries (e.g. every open dashboard tab
+# refreshing after a status change).
+#
+# Only use it for reads whose result does not depend on who asks. Followers
+# receive a deep copy, so callers may modify what they get back.
+import copy
+import os
+import threading
+from functools import wraps
+
+from services import metrics
+
+# Followers give up waiting after this long and compute the value themselves
+SINGLE_FLIGHT_TIMEOUT = float(os.environ.get("SINGLE_FLIGHT_TIMEOUT", "30"))
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.waiters = 0
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, name=None, **kwargs):
+        """Run fn(*args, **kwargs) once per key among concurrent callers."""
+        label = name or str(key)
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            if call.done.wait(SINGLE_FLIGHT_TIMEOUT):
+                metrics.single_flight_total.inc(1, label, "shared")
+                if call.error is not None:
+                    raise call.error
+                return copy.deepcopy(call.result)
+            metrics.single_flight_total.inc(1, label, "timeout")
+            return fn(*args, **kwargs)
+
+        metrics.single_flight_total.inc(1, label, "leader")
+        result = None
+        try:
+            result = fn(*args, **kwargs)
+            return result
+        except BaseException as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+                shared = call.waiters > 0
+            if shared and call.error is None:
+                # Snapshot, so the leader may modify its own result freely
+                call.result = copy.deepcopy(result)
+            call.done.set()
+
+
+flight = SingleFlight()
+
+
+def coalesce(name):
+    """Decorator: coalesce concurrent calls with equal arguments under name."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (name, args, tuple(sorted(kwargs.items())))
+            return flight.do(key, fn, *args, name=name, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,65 @@
+# services/statsService.py
+from config.db import get_db
+from services.singleFlight import coalesce
+
+# Every status counter, the unassigned count and the resolution-time inputs
+# come out of complaint_counters (see services/complaintCounters.py), which
+# holds a handful of rows per type and day instead of one per complaint.
+# The overall totals are folded together in Python from the per-type rows.
+COMPLAINT_SUMMARY_SQL = """
+    SELECT type,
+           SUM(total) AS total,
+           SUM(CASE WHEN status = 'Pending' THEN total END) AS pending,
+           SUM(CASE WHEN status = 'In Progress' THEN total END) AS inProgress,
+           SUM(CASE WHEN status = 'Solved' THEN total END) AS solved,
+           SUM(CASE WHEN status = 'Rejected' THEN total END) AS rejected,
+           SUM(CASE WHEN status = 'Unsolved' THEN total END) AS unsolved,
+           SUM(unassigned) AS unassigned,
+           SUM(CASE WHEN day = CURDATE() THEN total END) AS newToday,
+           SUM(resolution_days) AS resolutionDays,
+           SUM(resolution_samples) AS resolutionSamples
+    FROM complaint_counters
+    GROUP BY type
+    HAVING SUM(total) > 0
+"""
+
+COUNTER_KEYS = ("total", "pending", "inProgress", "solved", "rejected", "unsolved", "unassigned", "newToday")
+
+
+def _int(value):
+    return int(value) if value is not None else 0
+
+
+def summarize(rows):
+    """Fold per-type aggregate rows into overall totals plus the byType list."""
+    totals = dict.fromkeys(COUNTER_KEYS, 0)
+    resolution_days = 0
+    resolution_samples = 0
+    by_type = []
+
+    for row in rows:
+        entry = {"type": row["type"]}
+        for key in COUNTER_KEYS:
+            entry[key] = _int(row[key])
+            totals[key] += entry[key]
+        resolution_days += row["resolutionDays"] or 0
+        resolution_samples += _int(row["resolutionSamples"])
+        by_type.append(entry)
+
+    totals["avgResolutionDays"] = round(float(resolution_days) / resolution_samples, 2) if resolution_samples else 0
+    totals["byType"] = by_type
+    return totals
+
+
+@coalesce("complaint_summary")
+def complaint_summary():
+    """Single-pass complaint statistics shared by the admin and staff dashboards.
+
+    Concurrent callers in one worker share a single query (services/singleFlight.py).
+    """
+    cursor = get_db().cursor(dictionary=True)
+    try:
+        cursor.execute(COMPLAINT_SUMMARY_SQL)
+        return summarize(cursor.fetchall())
+    finally:
+        cursor.close()